@@ -0,0 +1,205 @@
+"""Async analysis pipeline on AsyncOpenAI with bounded concurrency.
+
+One AsyncPipeline per process owns a background event loop, a single AsyncOpenAI
+client and a concurrency semaphore. Any thread (a Streamlit script run, a worker)
+can hand it coroutines, so dozens of analyses stay in flight without a thread each.
+
+This is a standalone experiment for batch runs, not the app's code path: its stages are
+free-text prompts without the language registry, the eligibility rules engine, the
+SchemeStore or the structured scheme record, so its output differs from the app's.
+
+    python async_pipeline.py scheme1.pdf scheme2.pdf --languages Hindi Telugu Tamil
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Dict, List, Optional, Sequence
+
+from openai import AsyncOpenAI
+
+from caching import LRUCache, TieredCache
+from llm_client import AsyncCachedOpenAIClient, AsyncRateLimitedOpenAIClient, AsyncResilientOpenAIClient
+from pdf_extraction import (
+    fit_pages_to_budget, format_pages, formatted_token_count, iter_pdf_pages, parse_pages, split_into_chunks,
+)
+from prompts import (
+    SUMMARY_INPUT_TOKENS, chunk_summary_prompt, eligibility_prompt, label_partial, reduce_summary_prompt,
+    scheme_summary_prompt, translation_prompt,
+)
+from rate_limit import get_default_limiter
+from relevance import relevant_excerpt
+from resilience import HEDGE_REQUESTS
+
+logger = logging.getLogger(__name__)
+
+
+MODEL = "gpt-4o-mini"
+DEFAULT_MAX_CONCURRENCY = int(os.getenv("MYGOV_LLM_CONCURRENCY", "16"))
+
+
+class AsyncPipeline:
+    """Summary, eligibility and translation stages as coroutines sharing one client and semaphore.
+
+    Experimental: the stages mirror an earlier version of the app (see the module docstring).
+    """
+
+    def __init__(self, client, max_concurrency: int = DEFAULT_MAX_CONCURRENCY):
+        self.client = client
+        self.max_concurrency = max_concurrency
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="async-pipeline", daemon=True)
+        self._thread.start()
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    # --- Bridging from synchronous callers ---
+
+    def submit(self, coro: Awaitable) -> Future:
+        """Schedule a coroutine on the pipeline loop from any thread"""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    def run(self, coro: Awaitable, timeout: Optional[float] = None) -> Any:
+        """Run a coroutine on the pipeline loop and block the calling thread for its result"""
+        return self.submit(coro).result(timeout)
+
+    def close(self) -> None:
+        close = getattr(self.client, "close", None)
+        if close is not None:
+            self.run(close())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+
+    # --- Stages ---
+
+    async def complete(self, prompt: str, temperature: float) -> str:
+        async with self._semaphore:
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+            try:
+                response = await self.client.chat.completions.create(
+                    model=MODEL,
+                    messages=[{"role": "user", "content": prompt}],
+                    temperature=temperature
+                )
+            finally:
+                self.in_flight -= 1
+        return response.choices[0].message.content
+
+    async def summarize(self, text: str, max_tokens: int = SUMMARY_INPUT_TOKENS, long_document: str = "select",
+                        chunk_tokens: int = 3000) -> str:
+        pages = parse_pages(text)
+        if formatted_token_count(pages) <= max_tokens or long_document == "truncate":
+            return await self.complete(scheme_summary_prompt(fit_pages_to_budget(pages, max_tokens)), 0.3)
+        if long_document == "select":
+            return await self.complete(scheme_summary_prompt(relevant_excerpt(pages, max_tokens)), 0.3)
+
+        chunks = split_into_chunks(text, max_tokens=chunk_tokens)
+        total = len(chunks)
+        results = await asyncio.gather(
+            *(self.complete(chunk_summary_prompt(chunk, i + 1, total), 0.3) for i, chunk in enumerate(chunks)),
+            return_exceptions=True
+        )
+        partials = []
+        for i, result in enumerate(results):
+            if isinstance(result, Exception):
+                logger.error(f"Error summarizing part {i + 1} of {total}: {str(result)}")
+            else:
+                partials.append(label_partial(result, i + 1, total))
+        if not partials:
+            raise RuntimeError("all document parts failed to summarize")
+        return await self.complete(reduce_summary_prompt(partials), 0.3)
+
+    async def check_eligibility(self, summary: str, user_profile: Dict) -> str:
+        return await self.complete(eligibility_prompt(summary, user_profile), 0.2)
+
+    async def translate(self, text: str, language: str) -> str:
+        return await self.complete(translation_prompt(text, language), 0.3)
+
+    async def _stage(self, coro: Awaitable, error_label: str) -> str:
+        # Same contract as the synchronous functions: failures come back as readable text
+        try:
+            return await coro
+        except Exception as e:
+            logger.error(f"{error_label}: {str(e)}")
+            return f"{error_label}: {str(e)}"
+
+    async def analyze(self, text: str, user_profile: Optional[Dict] = None,
+                      languages: Sequence[str] = ("Hindi",)) -> Dict[str, Any]:
+        """Summary, then eligibility, then every translation concurrently"""
+        summary = await self._stage(self.summarize(text), "Error generating summary")
+        result: Dict[str, Any] = {"summary": summary}
+
+        texts = [summary]
+        if user_profile:
+            eligibility = await self._stage(self.check_eligibility(summary, user_profile), "Error checking eligibility")
+            result["eligibility"] = eligibility
+            texts.append(eligibility)
+
+        # Summary and eligibility are translated separately so the profile-independent summary
+        # translation is a response-cache hit for every later user of the same document
+        translated = await asyncio.gather(*(
+            self._stage(self.translate(text, language), "Translation error") for language in languages for text in texts
+        ))
+        result["translations"] = {
+            language: "\n\n---\n".join(translated[i * len(texts):(i + 1) * len(texts)])
+            for i, language in enumerate(languages)
+        }
+        return result
+
+
+_shared_pipeline: Optional[AsyncPipeline] = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_pipeline(api_key: Optional[str] = None, cache: Optional[TieredCache] = None,
+                        max_concurrency: int = DEFAULT_MAX_CONCURRENCY) -> AsyncPipeline:
+    """Process-wide pipeline; the first caller's settings win"""
+    global _shared_pipeline
+    with _shared_lock:
+        if _shared_pipeline is None:
+            # Same layering as the synchronous client: cache -> retries/hedging -> rate limit -> API,
+            # sharing the process-wide RPM/TPM budget
+            client = AsyncRateLimitedOpenAIClient(
+                AsyncOpenAI(api_key=api_key or os.getenv("OPENAI_API_KEY"), max_retries=0), get_default_limiter()
+            )
+            client = AsyncResilientOpenAIClient(client, hedge=HEDGE_REQUESTS)
+            cache = cache or TieredCache(LRUCache(max_entries=512, ttl=7 * 24 * 3600))
+            _shared_pipeline = AsyncPipeline(AsyncCachedOpenAIClient(client, cache), max_concurrency)
+        return _shared_pipeline
+
+
+def main():
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("pdfs", nargs="+")
+    parser.add_argument("--languages", nargs="*", default=["Hindi"])
+    parser.add_argument("--profile", help="JSON object with get_user_profile() fields")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_MAX_CONCURRENCY)
+    args = parser.parse_args()
+
+    profile = json.loads(args.profile) if args.profile else None
+    texts: List[str] = []
+    for path in args.pdfs:
+        with open(path, "rb") as f:
+            texts.append(format_pages(iter_pdf_pages(f.read())))
+
+    pipeline = get_shared_pipeline(max_concurrency=args.concurrency)
+
+    async def analyze_all():
+        return await asyncio.gather(*(pipeline.analyze(text, profile, args.languages) for text in texts))
+
+    try:
+        results = pipeline.run(analyze_all())
+    finally:
+        pipeline.close()
+    print(json.dumps(dict(zip(args.pdfs, results)), ensure_ascii=False, indent=2))
+    logger.info(f"Peak concurrent LLM calls: {pipeline.peak_in_flight}")
+
+
+if __name__ == "__main__":
+    main()
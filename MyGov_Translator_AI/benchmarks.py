@@ -0,0 +1,394 @@
+"""Micro-benchmarks for the MyGov Translator AI pipeline.
+
+Run from this directory, e.g.:
+
+    python benchmarks.py extraction --pages 300
+"""
+import argparse
+import csv
+import io
+import json
+import os
+import random
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import fitz  # PyMuPDF
+import requests
+
+import bulk_screening
+import pdf_extraction
+import relevance
+import translation
+from eligibility_rules import EligibilityRules
+from languages import combined_translation_schema, resolve_languages
+from prompts import multi_translation_prompt, translation_prompt
+from scheme_record import SchemeRecord, render_scheme_markdown
+from segmentation import segment_markdown
+from tokenizer import count_tokens
+from translation_backends import GoogleBackend
+
+
+def _time_it(fn: Callable, repeat: int) -> float:
+    """Best-of-N wall-clock time in seconds"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def make_synthetic_pdf(pages: int, lines_per_page: int = 45) -> bytes:
+    """Build a gazette-style PDF with dense text on every page"""
+    document = fitz.open()
+    line = "Beneficiaries aged 18 to 60 with annual family income below Rs 2.5 lakh are eligible under clause"
+    for page_num in range(pages):
+        page = document.new_page()
+        body = "\n".join(f"{line} {page_num + 1}.{i + 1}" for i in range(lines_per_page))
+        page.insert_textbox(fitz.Rect(36, 36, 576, 806), body, fontsize=8)
+    data = document.tobytes()
+    document.close()
+    return data
+
+
+def bench_extraction(args) -> Dict[str, float]:
+    if args.workers:
+        pdf_extraction.EXTRACTION_WORKERS = args.workers
+    pdf_bytes = make_synthetic_pdf(args.pages)
+    serial = _time_it(lambda: list(pdf_extraction.iter_pdf_pages(pdf_bytes, mode="serial")), args.repeat)
+    # The first run starts the shared pool; later runs reuse it like the app does
+    cold = _time_it(lambda: list(pdf_extraction.iter_pdf_pages(pdf_bytes, mode="parallel")), 1)
+    parallel = _time_it(lambda: list(pdf_extraction.iter_pdf_pages(pdf_bytes, mode="parallel")), args.repeat)
+    auto = _time_it(lambda: list(pdf_extraction.iter_pdf_pages(pdf_bytes, mode="auto")), args.repeat)
+    print(
+        f"pages={args.pages} usable_cpus={pdf_extraction.usable_cpus()} host_cpus={os.cpu_count()} "
+        f"workers={pdf_extraction.EXTRACTION_WORKERS}"
+    )
+    print(f"serial:          {serial * 1000:8.1f} ms")
+    print(f"parallel (cold): {cold * 1000:8.1f} ms  (speedup x{serial / cold:.2f})")
+    print(f"parallel (warm): {parallel * 1000:8.1f} ms  (speedup x{serial / parallel:.2f})")
+    print(f"auto:            {auto * 1000:8.1f} ms  (speedup x{serial / auto:.2f})")
+    return {"serial": serial, "parallel_cold": cold, "parallel": parallel, "auto": auto}
+
+
+def make_profiles_csv(rows: int, seed: int = 7) -> str:
+    """Random beneficiary profiles with the get_user_profile() columns plus an id"""
+    rng = random.Random(seed)
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(["beneficiary_id"] + bulk_screening.PROFILE_FIELDS)
+    vocabularies = [bulk_screening.VOCABULARIES[name] for name in bulk_screening.PROFILE_FIELDS[1:]]
+    for i in range(rows):
+        writer.writerow([i, rng.randint(10, 80)] + [rng.choice(vocabulary) for vocabulary in vocabularies])
+    return out.getvalue()
+
+
+def bench_screening(args) -> Dict[str, float]:
+    rules = EligibilityRules(
+        min_age=18, max_age=60, max_annual_income=250000,
+        categories=["SC", "ST", "OBC"], occupations=["Farmer", "Self-employed"],
+    )
+    data = make_profiles_csv(args.rows)
+
+    rows = list(csv.DictReader(io.StringIO(data)))
+    screen = bulk_screening.compile_screen(rules)
+    batch = bulk_screening.encode_profiles(rows)
+    encode = _time_it(lambda: bulk_screening.encode_profiles(rows), args.repeat)
+    evaluate = _time_it(lambda: bulk_screening.screen_batch(screen, batch), args.repeat)
+    end_to_end = _time_it(
+        lambda: bulk_screening.screen_csv(rules, io.StringIO(data), io.StringIO()), args.repeat
+    )
+    print(f"profiles={args.rows}")
+    print(f"encode:      {encode * 1000:8.1f} ms  ({args.rows / encode:12,.0f} profiles/s)")
+    print(f"evaluate:    {evaluate * 1000:8.1f} ms  ({args.rows / evaluate:12,.0f} profiles/s)")
+    print(f"CSV in->out: {end_to_end * 1000:8.1f} ms  ({args.rows / end_to_end:12,.0f} profiles/s)")
+    return {"encode": encode, "evaluate": evaluate, "end_to_end": end_to_end}
+
+
+def make_scheme_pages(pages: int, seed: int = 7) -> List[pdf_extraction.PageRecord]:
+    """Long gazette-style pages: mostly boilerplate, with scattered benefit/eligibility/document clauses"""
+    rng = random.Random(seed)
+    filler = "The Department shall review the implementation of the scheme and publish periodic reports. "
+    clauses = [
+        "Eligible farmers receive financial assistance of Rs 6,000 per annum in three installments. ",
+        "Applicants must be residents aged 18 to 60 years with family income below Rs 2.5 lakh. ",
+        "Required documents: Aadhaar card, bank passbook copy and income certificate. ",
+        "Apply online through the portal or submit the form at the block office. ",
+        "The last date for registration is 31 March; contact the helpline for queries. ",
+    ]
+    records = []
+    for page_num in range(1, pages + 1):
+        paragraphs = [filler * 6 for _ in range(5)]
+        if rng.random() < 0.2:
+            paragraphs[rng.randrange(5)] = rng.choice(clauses) * 2
+        text = "\n\n".join(paragraphs)
+        records.append(pdf_extraction.PageRecord(page_num, text, len(text), count_tokens(text)))
+    return records
+
+
+def bench_relevance(args) -> Dict[str, float]:
+    pages = make_scheme_pages(args.pages)
+    chunks = relevance.chunk_pages(pages)
+    build = _time_it(lambda: relevance.BM25Index(chunk.text for chunk in chunks), args.repeat)
+    select = _time_it(lambda: relevance.relevant_excerpt(pages, args.budget), args.repeat)
+    document_tokens = pdf_extraction.formatted_token_count(pages)
+    excerpt_tokens = count_tokens(relevance.relevant_excerpt(pages, args.budget))
+    print(f"pages={args.pages} chunks={len(chunks)} document_tokens={document_tokens:,}")
+    print(f"index build:         {build * 1000:8.1f} ms")
+    print(f"chunk+index+select:  {select * 1000:8.1f} ms  -> {excerpt_tokens:,} tokens "
+          f"({excerpt_tokens / document_tokens:.1%} of the document)")
+    return {"build": build, "select": select}
+
+
+class _FakeTranslateHandler(BaseHTTPRequestHandler):
+    """Answers like Google's mobile translate page (echoing the query), with keep-alive, after a fixed delay"""
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out as separate writes; without TCP_NODELAY a reused connection
+    # stalls on Nagle + delayed ACK, which real frontends don't
+    disable_nagle_algorithm = True
+    delay = 0.0
+    collapse_newlines = False
+
+    def do_GET(self):
+        time.sleep(self.delay)
+        query = parse_qs(urlsplit(self.path).query).get("q", ["translated"])[0]
+        if self.collapse_newlines:
+            query = " ".join(query.split("\n"))
+        body = f'<html><body><div class="result-container">{escape(query)}</div></body></html>'.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _per_request_ms(fn: Callable[[], object], requests_count: int) -> float:
+    start = time.perf_counter()
+    for _ in range(requests_count):
+        fn()
+    return (time.perf_counter() - start) / requests_count * 1000
+
+
+def _translate_endpoint(args) -> Tuple[str, Optional[ThreadingHTTPServer]]:
+    """Google's endpoint with --live, otherwise a local stub server (which the caller shuts down)"""
+    if args.live:
+        return GoogleBackend("hi").base_url, None
+    _FakeTranslateHandler.delay = args.server_delay_ms / 1000
+    _FakeTranslateHandler.collapse_newlines = getattr(args, "collapse_newlines", False)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FakeTranslateHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_address[1]}/m", server
+
+
+def bench_translation_sessions(args) -> Dict[str, float]:
+    """Round trip per translation call: a fresh connection per call (deep_translator) vs a pooled session"""
+    url, server = _translate_endpoint(args)
+
+    params = {"tl": "hi", "sl": "auto", "q": "Apply at the nearest CSC centre"}
+    backend = GoogleBackend("hi", base_url=url)
+    try:
+        fresh = _per_request_ms(lambda: requests.get(url, params=params, timeout=15).close(), args.requests)
+        pooled = _per_request_ms(lambda: backend.translate(params["q"]), args.requests)
+    finally:
+        backend.close()
+        if server is not None:
+            server.shutdown()
+    print(f"endpoint={'live Google' if args.live else 'local keep-alive stub'} requests={args.requests}")
+    print(f"fresh connection per call: {fresh:8.2f} ms/request")
+    print(f"pooled session:            {pooled:8.2f} ms/request  (x{fresh / pooled:.2f})")
+    return {"fresh": fresh, "pooled": pooled}
+
+
+SAMPLE_SCHEME = SchemeRecord(
+    name="PM Kisan Samman Nidhi",
+    purpose="Income support to landholding farmer families to meet farming and household needs.",
+    benefits=["Rs 6,000 per year paid in three installments of Rs 2,000 directly to the bank account"],
+    eligibility_criteria=["Landholding farmer family", "Not an income tax payer", "Aadhaar-linked bank account"],
+    required_documents=["Aadhaar card", "Land records", "Bank passbook"],
+    application_steps=["Register on the PM-Kisan portal or at a CSC centre", "Complete e-KYC", "Track status online"],
+    deadlines=["Registration is open throughout the year"],
+    amounts=["Rs 2,000 per installment"],
+    contact="PM-Kisan helpline 155261",
+)
+
+
+def _chat(client, prompt: str, **kwargs) -> Tuple[str, int, int]:
+    response = client.chat.completions.create(
+        model="gpt-4o-mini", messages=[{"role": "user", "content": prompt}], temperature=0.3, **kwargs
+    )
+    return response.choices[0].message.content, response.usage.prompt_tokens, response.usage.completion_tokens
+
+
+def bench_llm_translation(args) -> Dict[str, float]:
+    """Per-language LLM translation calls vs one structured-output call for all languages"""
+    languages = resolve_languages(args.languages)
+    text = render_scheme_markdown(SAMPLE_SCHEME)
+    per_language = [translation_prompt(text, language.name) for language in languages]
+    combined = multi_translation_prompt(text, {language.code: language.name for language in languages})
+    per_language_input = sum(count_tokens(prompt) for prompt in per_language)
+    combined_input = count_tokens(combined)
+    print(f"languages={','.join(language.code for language in languages)} text_tokens={count_tokens(text):,}")
+    print(f"input tokens  per-language: {per_language_input:6,}  combined: {combined_input:6,}  "
+          f"(saves {1 - combined_input / per_language_input:.0%})")
+    if not args.live:
+        print("output tokens are the same translations either way; pass --live to measure latency and usage")
+        return {"per_language_input": per_language_input, "combined_input": combined_input}
+
+    from openai import OpenAI
+    client = OpenAI()
+    response_format = {
+        "type": "json_schema",
+        "json_schema": {
+            "name": "translations", "strict": True,
+            "schema": combined_translation_schema([language.code for language in languages]),
+        },
+    }
+    results = {}
+    for mode in ("per-language", "combined"):
+        latencies, prompt_tokens, completion_tokens = [], 0, 0
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            if mode == "combined":
+                calls = [_chat(client, combined, response_format=response_format)]
+                json.loads(calls[0][0])
+            else:
+                # Same as the app: every language in flight at once
+                with ThreadPoolExecutor(max_workers=len(per_language)) as pool:
+                    calls = list(pool.map(lambda prompt: _chat(client, prompt), per_language))
+            latencies.append(time.perf_counter() - start)
+            prompt_tokens += sum(call[1] for call in calls)
+            completion_tokens += sum(call[2] for call in calls)
+        latency = sorted(latencies)[len(latencies) // 2]
+        print(f"{mode:13s} median {latency * 1000:8.0f} ms  prompt {prompt_tokens // args.repeat:6,}  "
+              f"completion {completion_tokens // args.repeat:6,} tokens/run")
+        results[mode] = latency
+    return results
+
+
+_NAIVE_SPLIT = re.compile(r'[.!?]+')
+
+
+def make_markdown_corpus(target_chars: int, seed: int = 7) -> str:
+    """Summary-style markdown mixing English and Hindi, with amounts, abbreviations and URLs"""
+    rng = random.Random(seed)
+    lines = render_scheme_markdown(SAMPLE_SCHEME).split("\n") + [
+        "- Assistance of ₹1.5 lakh is given, i.e. Rs. 50,000 per year. Visit https://pmkisan.gov.in/faq.html for details.",
+        "किसानों को प्रति वर्ष ₹6,000 की सहायता दी जाती है। आवेदन ऑनलाइन या CSC केंद्र पर करें।",
+        "Contact Dr. A. K. Verma, Dept. of Agriculture, etc. on working days. Applications close on 31.03.2025!",
+    ]
+    out, size = [], 0
+    while size < target_chars:
+        line = rng.choice(lines)
+        out.append(line)
+        size += len(line) + 1
+    return "\n".join(out)
+
+
+def bench_segmentation(args) -> Dict[str, float]:
+    text = make_markdown_corpus(int(args.megabytes * 1_000_000))
+    naive = _time_it(lambda: [s.strip() for s in _NAIVE_SPLIT.split(text) if len(s.strip()) > 2], args.repeat)
+    segments, join = segment_markdown(text)
+    markdown = _time_it(lambda: segment_markdown(text), args.repeat)
+    rejoin = _time_it(lambda: join(segments), args.repeat)
+    megabytes = len(text.encode("utf-8")) / 1_000_000
+    unique = len({" ".join(segment.split()).casefold() for segment in segments})
+    print(f"text={megabytes:.1f} MB lines={text.count(chr(10)) + 1:,} segments={len(segments):,} unique={unique:,}")
+    print(f"naive re.split:   {naive * 1000:8.1f} ms  ({megabytes / naive:6.1f} MB/s)")
+    print(f"segment_markdown: {markdown * 1000:8.1f} ms  ({megabytes / markdown:6.1f} MB/s)")
+    print(f"rejoin:           {rejoin * 1000:8.1f} ms  (layout round-trips: {join(segments) == text})")
+    return {"naive": naive, "segment": markdown, "rejoin": rejoin}
+
+
+def bench_translation_batching(args) -> Dict[str, float]:
+    """Whether the endpoint keeps the newlines between batched segments, and the requests it costs.
+
+    Every call starts out probing (one batch, the rest singly); batching turns on once the
+    probes come back aligned, so the same document is translated --calls times.
+    """
+    url, server = _translate_endpoint(args)
+    segments, _ = segment_markdown(make_markdown_corpus(args.chars))
+    backend = GoogleBackend(args.target, base_url=url)
+    key = translation.backend_key(backend)
+    print(f"endpoint={'live Google' if args.live else 'local stub'} segments={len(segments):,} "
+          f"unique={len({' '.join(s.split()).casefold() for s in segments}):,}")
+    try:
+        for call in range(1, args.calls + 1):
+            mode = translation.batch_stats.mode(key)
+            start = time.perf_counter()
+            result = translation.translate_segments(segments, args.target, translator=backend)
+            elapsed = time.perf_counter() - start
+            print(f"call {call}: mode={mode:<6} requests={result.requests:,} fell_back={result.fallbacks:,} "
+                  f"time={elapsed * 1000:,.0f} ms")
+    finally:
+        backend.close()
+        if server is not None:
+            server.shutdown()
+    stats = translation.batch_stats.stats()
+    print(f"batches aligned={stats['aligned']} misaligned={stats['misaligned']} failed={stats['failed']} "
+          f"(newlines {'kept' if stats['misaligned'] == 0 and stats['aligned'] else 'NOT kept'})")
+    return {"requests": result.requests, "misaligned": stats["misaligned"]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    extraction = subparsers.add_parser("extraction", help="serial vs process-pool PDF extraction")
+    extraction.add_argument("--pages", type=int, default=300)
+    extraction.add_argument("--workers", type=int, default=None, help="pool size (default: usable CPUs)")
+    extraction.add_argument("--repeat", type=int, default=3)
+    extraction.set_defaults(func=bench_extraction)
+
+    screening = subparsers.add_parser("screening", help="vectorized bulk eligibility screening")
+    screening.add_argument("--rows", type=int, default=200000)
+    screening.add_argument("--repeat", type=int, default=3)
+    screening.set_defaults(func=bench_screening)
+
+    relevance_parser = subparsers.add_parser("relevance", help="BM25 chunk index build and passage selection")
+    relevance_parser.add_argument("--pages", type=int, default=300)
+    relevance_parser.add_argument("--budget", type=int, default=6000)
+    relevance_parser.add_argument("--repeat", type=int, default=3)
+    relevance_parser.set_defaults(func=bench_relevance)
+
+    sessions = subparsers.add_parser("translation-sessions", help="fresh connection per call vs pooled session")
+    sessions.add_argument("--requests", type=int, default=200)
+    sessions.add_argument("--server-delay-ms", type=float, default=0.0)
+    sessions.add_argument("--live", action="store_true", help="measure against translate.google.com (network)")
+    sessions.set_defaults(func=bench_translation_sessions)
+
+    llm_translation = subparsers.add_parser("llm-translation", help="per-language vs one-shot LLM translation")
+    llm_translation.add_argument("--languages", nargs="+", default=["hi", "te", "ta"])
+    llm_translation.add_argument("--repeat", type=int, default=3)
+    llm_translation.add_argument("--live", action="store_true", help="call the OpenAI API (needs OPENAI_API_KEY)")
+    llm_translation.set_defaults(func=bench_llm_translation)
+
+    segmentation = subparsers.add_parser("segmentation", help="markdown-aware sentence segmenter throughput")
+    segmentation.add_argument("--megabytes", type=float, default=5.0)
+    segmentation.add_argument("--repeat", type=int, default=3)
+    segmentation.set_defaults(func=bench_segmentation)
+
+    batching = subparsers.add_parser("translation-batching", help="newline-joined batches against the endpoint")
+    batching.add_argument("--chars", type=int, default=20000)
+    batching.add_argument("--target", default="te")
+    batching.add_argument("--calls", type=int, default=8)
+    batching.add_argument("--server-delay-ms", type=float, default=0.0)
+    batching.add_argument("--collapse-newlines", action="store_true", help="local stub joins lines like a lossy backend")
+    batching.add_argument("--live", action="store_true", help="measure against translate.google.com (network)")
+    batching.set_defaults(func=bench_translation_batching)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
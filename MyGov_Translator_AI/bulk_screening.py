@@ -0,0 +1,183 @@
+import csv
+import logging
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+import numpy as np
+
+from eligibility_rules import (
+    CATEGORIES, EDUCATION_LEVELS, FAIL, GENDERS, INCOME_BRACKETS, MEMBERSHIP_CRITERIA, OCCUPATIONS,
+    PASS, STATES, EligibilityRules, age_bounds, check_education, check_income, check_membership,
+)
+
+logger = logging.getLogger(__name__)
+
+
+# Same column names as the get_user_profile() dict
+PROFILE_FIELDS = ["age", "gender", "income", "category", "state", "occupation", "education"]
+
+VOCABULARIES: Dict[str, List[str]] = {
+    "gender": GENDERS,
+    "income": INCOME_BRACKETS,
+    "category": CATEGORIES,
+    "state": STATES,
+    "occupation": OCCUPATIONS,
+    "education": EDUCATION_LEVELS,
+}
+
+# Bit position of each criterion in the per-row failure mask
+CRITERIA_BITS = ["Age", "Income"] + [criterion for criterion, _, _ in MEMBERSHIP_CRITERIA] + ["Education"]
+
+ELIGIBLE, NOT_ELIGIBLE, NEEDS_REVIEW = 0, 1, 2
+STATUS_LABELS = np.array(["ELIGIBLE", "NOT ELIGIBLE", "NEEDS REVIEW"])
+
+# Outcome codes used inside the lookup tables
+_PASS, _FAIL, _UNKNOWN = 0, 1, 2
+
+# Case-insensitive value -> code maps; unrecognised values encode to -1
+_CODE_MAPS = {
+    name: {value.casefold(): code for code, value in enumerate(vocabulary)}
+    for name, vocabulary in VOCABULARIES.items()
+}
+
+
+@dataclass
+class ProfileBatch:
+    """Column-wise encoded profiles: ages as float (NaN when missing), categoricals as vocabulary codes"""
+    age: np.ndarray
+    codes: Dict[str, np.ndarray]
+
+    def __len__(self) -> int:
+        return len(self.age)
+
+
+def encode_profiles(rows: List[Dict[str, str]]) -> ProfileBatch:
+    """Encode CSV rows (strings) into NumPy arrays"""
+    ages = np.empty(len(rows), dtype=np.float32)
+    for i, row in enumerate(rows):
+        try:
+            ages[i] = float(row.get("age") or "nan")
+        except ValueError:
+            ages[i] = np.nan
+
+    codes = {}
+    for name, code_map in _CODE_MAPS.items():
+        codes[name] = np.fromiter(
+            (code_map.get((row.get(name) or "").strip().casefold(), -1) for row in rows),
+            dtype=np.int16, count=len(rows),
+        )
+    return ProfileBatch(ages, codes)
+
+
+def _outcome_code(outcome: str) -> int:
+    return _PASS if outcome == PASS else _FAIL if outcome == FAIL else _UNKNOWN
+
+
+def _lookup_table(vocabulary: List[str], check) -> np.ndarray:
+    """Outcome per vocabulary code, shifted by one so code -1 (unrecognised) lands on index 0"""
+    return np.array([_outcome_code(check(None).outcome)] + [
+        _outcome_code(check(value).outcome) for value in vocabulary
+    ], dtype=np.int8)
+
+
+@dataclass
+class CompiledScreen:
+    """Lookup tables derived once from EligibilityRules, reused for every batch"""
+    age_bounds: Optional[Tuple[int, int]]
+    tables: Dict[str, Tuple[int, np.ndarray]]
+    needs_review: bool
+
+
+def compile_screen(rules: EligibilityRules) -> CompiledScreen:
+    """Precompute outcome tables using the same checks as evaluate_rules()"""
+    tables = {}
+    if rules.max_annual_income is not None:
+        tables["income"] = (
+            CRITERIA_BITS.index("Income"),
+            _lookup_table(INCOME_BRACKETS, lambda value: check_income(rules, value)),
+        )
+    for criterion, key, attribute in MEMBERSHIP_CRITERIA:
+        allowed = getattr(rules, attribute)
+        if allowed:
+            tables[key] = (
+                CRITERIA_BITS.index(criterion),
+                _lookup_table(VOCABULARIES[key], lambda value, c=criterion, a=allowed: check_membership(c, value, a)),
+            )
+    if rules.min_education:
+        tables["education"] = (
+            CRITERIA_BITS.index("Education"),
+            _lookup_table(EDUCATION_LEVELS, lambda value: check_education(rules, value)),
+        )
+
+    has_age = rules.min_age is not None or rules.max_age is not None
+    # Like evaluate_rules(), never call a profile ELIGIBLE when no criterion was checked at all
+    # (e.g. rules compiled from an error message): everything not failed needs review
+    needs_review = bool(rules.unresolved_criteria) or not (has_age or tables)
+    return CompiledScreen(age_bounds(rules) if has_age else None, tables, needs_review)
+
+
+def screen_batch(screen: CompiledScreen, batch: ProfileBatch) -> Tuple[np.ndarray, np.ndarray]:
+    """Return (status, failure bitmask) arrays for every profile in the batch"""
+    n = len(batch)
+    failed_bits = np.zeros(n, dtype=np.uint8)
+    unknown = np.full(n, screen.needs_review, dtype=bool)
+
+    if screen.age_bounds is not None:
+        low, high = screen.age_bounds
+        missing = np.isnan(batch.age)
+        outside = ~missing & ((batch.age < low) | (batch.age > high))
+        failed_bits |= outside.astype(np.uint8) << CRITERIA_BITS.index("Age")
+        unknown |= missing
+
+    for key, (bit, table) in screen.tables.items():
+        outcomes = table[batch.codes[key] + 1]
+        failed_bits |= (outcomes == _FAIL).astype(np.uint8) << bit
+        unknown |= outcomes == _UNKNOWN
+
+    status = np.where(failed_bits > 0, NOT_ELIGIBLE, np.where(unknown, NEEDS_REVIEW, ELIGIBLE)).astype(np.int8)
+    return status, failed_bits
+
+
+# Every failure bitmask rendered once, so output formatting is a single array lookup
+_FAILURE_LABELS = np.array([
+    "; ".join(name for bit, name in enumerate(CRITERIA_BITS) if mask & (1 << bit))
+    for mask in range(1 << len(CRITERIA_BITS))
+], dtype=object)
+
+
+def _chunks(reader: Iterable[Dict[str, str]], size: int) -> Iterator[List[Dict[str, str]]]:
+    chunk = []
+    for row in reader:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def screen_csv(rules: EligibilityRules, infile: TextIO, outfile: TextIO, chunk_size: int = 50000) -> Dict[str, int]:
+    """Stream profiles from CSV, screen them in vectorized chunks and write results as CSV"""
+    screen = compile_screen(rules)
+    reader = csv.DictReader(infile)
+    missing = [name for name in PROFILE_FIELDS if name not in (reader.fieldnames or [])]
+    if missing:
+        raise ValueError(f"CSV is missing profile columns: {', '.join(missing)}")
+
+    writer = csv.writer(outfile)
+    writer.writerow(list(reader.fieldnames) + ["eligibility_status", "failed_criteria"])
+    counts = {str(label): 0 for label in STATUS_LABELS}
+
+    for rows in _chunks(reader, chunk_size):
+        status, failed_bits = screen_batch(screen, encode_profiles(rows))
+        labels = STATUS_LABELS[status]
+        reasons = _FAILURE_LABELS[failed_bits]
+        writer.writerows(
+            [row.get(name) for name in reader.fieldnames] + [label, reason]
+            for row, label, reason in zip(rows, labels, reasons)
+        )
+        for code, count in zip(*np.unique(status, return_counts=True)):
+            counts[str(STATUS_LABELS[code])] += int(count)
+
+    logger.info(f"Screened {sum(counts.values())} profiles: {counts}")
+    return counts
@@ -0,0 +1,301 @@
+import json
+import math
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+
+# Profile vocabularies shared by the profile form, the rule compiler and bulk screening
+GENDERS = ["Male", "Female", "Other", "Prefer not to say"]
+INCOME_BRACKETS = [
+    "Below ₹1 Lakh", "₹1-3 Lakhs", "₹3-5 Lakhs",
+    "₹5-10 Lakhs", "₹10-20 Lakhs", "Above ₹20 Lakhs"
+]
+CATEGORIES = ["General", "OBC", "SC", "ST", "EWS"]
+STATES = [
+    "Andhra Pradesh", "Telangana", "Tamil Nadu", "Karnataka", "Kerala",
+    "Maharashtra", "Gujarat", "Rajasthan", "Uttar Pradesh", "Bihar",
+    "West Bengal", "Odisha", "Madhya Pradesh", "Chhattisgarh", "Jharkhand",
+    "Haryana", "Punjab", "Himachal Pradesh", "Uttarakhand", "Delhi",
+    "Other"
+]
+OCCUPATIONS = [
+    "Farmer", "Student", "Government Employee", "Private Employee",
+    "Self-employed", "Business Owner", "Unemployed", "Retired", "Other"
+]
+# Ordered lowest to highest so "minimum education" rules can compare ranks
+EDUCATION_LEVELS = [
+    "Primary School", "High School", "Intermediate", "Graduate",
+    "Post Graduate", "Professional Degree", "Others"
+]
+
+# Annual income range in rupees covered by each bracket: [low, high)
+INCOME_RANGES: Dict[str, Tuple[float, float]] = {
+    "Below ₹1 Lakh": (0, 100000),
+    "₹1-3 Lakhs": (100000, 300000),
+    "₹3-5 Lakhs": (300000, 500000),
+    "₹5-10 Lakhs": (500000, 1000000),
+    "₹10-20 Lakhs": (1000000, 2000000),
+    "Above ₹20 Lakhs": (2000000, float("inf")),
+}
+
+# Profile answers that carry no information for a restricted criterion
+_UNSPECIFIED = {"Other", "Others", "Prefer not to say"}
+
+PASS, FAIL, UNKNOWN = "pass", "fail", "unknown"
+
+
+@dataclass
+class EligibilityRules:
+    """Machine-checkable eligibility criteria compiled once per scheme; empty lists mean "any" """
+    min_age: Optional[int] = None
+    max_age: Optional[int] = None
+    max_annual_income: Optional[float] = None
+    genders: List[str] = field(default_factory=list)
+    categories: List[str] = field(default_factory=list)
+    states: List[str] = field(default_factory=list)
+    occupations: List[str] = field(default_factory=list)
+    min_education: Optional[str] = None
+    unresolved_criteria: List[str] = field(default_factory=list)
+
+    @property
+    def has_formal_criteria(self) -> bool:
+        return any([
+            self.min_age is not None, self.max_age is not None, self.max_annual_income is not None,
+            self.genders, self.categories, self.states, self.occupations, self.min_education,
+        ])
+
+
+@dataclass
+class RuleCheck:
+    criterion: str
+    outcome: str
+    detail: str
+
+
+@dataclass
+class EligibilityResult:
+    checks: List[RuleCheck]
+    unresolved_criteria: List[str]
+
+    @property
+    def failed(self) -> List[RuleCheck]:
+        return [check for check in self.checks if check.outcome == FAIL]
+
+    @property
+    def status(self) -> Optional[str]:
+        """ELIGIBLE / NOT ELIGIBLE when the local rules settle it, otherwise None"""
+        if self.failed:
+            return "NOT ELIGIBLE"
+        if self.checks and not self.unresolved_criteria and all(c.outcome == PASS for c in self.checks):
+            return "ELIGIBLE"
+        return None
+
+    @property
+    def is_conclusive(self) -> bool:
+        return self.status is not None
+
+
+RULES_PROMPT = """
+        Extract the eligibility criteria from the government scheme summary below.
+
+        - min_age, max_age: age limits in years, or null
+        - max_annual_income: annual family income ceiling in rupees as a number (2.5 lakh is 250000), or null
+        - genders, categories, states, occupations: the values the scheme is limited to, or [] if open to all
+        - min_education: the lowest qualification accepted, or null
+        - unresolved_criteria: every other criterion, copied as short plain sentences
+
+        Any criterion that cannot be expressed with the listed values (land ownership, disability,
+        BPL card, family size, etc.) goes into "unresolved_criteria".
+
+        SCHEME SUMMARY:
+        {summary}
+        """
+
+
+def _one_of(values: List[str]) -> Dict:
+    return {"type": "array", "items": {"type": "string", "enum": values}}
+
+
+# Strict structured-output schema: the list criteria can only hold profile vocabulary values
+RULES_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "min_age": {"type": ["integer", "null"]},
+        "max_age": {"type": ["integer", "null"]},
+        "max_annual_income": {"type": ["number", "null"]},
+        "genders": _one_of(GENDERS[:2]),
+        "categories": _one_of(CATEGORIES),
+        "states": _one_of(STATES[:-1]),
+        "occupations": _one_of(OCCUPATIONS[:-1]),
+        "min_education": {"type": ["string", "null"], "enum": [*EDUCATION_LEVELS[:-1], None]},
+        "unresolved_criteria": {"type": "array", "items": {"type": "string"}},
+    },
+    "required": [
+        "min_age", "max_age", "max_annual_income", "genders", "categories", "states", "occupations",
+        "min_education", "unresolved_criteria",
+    ],
+    "additionalProperties": False,
+}
+
+
+def _as_number(value, name: str, unresolved: List[str]) -> Optional[float]:
+    """A finite number, or None when absent; a value that can't be read goes to unresolved instead"""
+    if value is None:
+        return None
+    try:
+        number = None if isinstance(value, bool) else float(value)
+    except (TypeError, ValueError):
+        number = None
+    if number is not None and math.isfinite(number):
+        return number
+    # Dropping it would make the local rules look more permissive than the scheme
+    unresolved.append(f"{name}: {value}")
+    return None
+
+
+def _pick(values, vocabulary: List[str], name: str, unresolved: List[str]) -> List[str]:
+    if values is None:
+        return []
+    if not isinstance(values, list):
+        unresolved.append(f"{name}: {values}")
+        return []
+    values = [str(value) for value in values]
+    if all(value in vocabulary for value in values):
+        return values
+    # A partially mapped list would wrongly reject profiles matching the unmapped values,
+    # so the whole criterion is left to the model instead
+    unresolved.append(f"{name}: {', '.join(values)}")
+    return []
+
+
+def parse_rules(data: Dict) -> EligibilityRules:
+    """Validate compiler output against the profile vocabularies; anything unreadable becomes unresolved"""
+    unresolved_criteria = data.get("unresolved_criteria") or []
+    if not isinstance(unresolved_criteria, list):
+        unresolved_criteria = [unresolved_criteria]
+    unresolved = [str(c) for c in unresolved_criteria if str(c).strip()]
+    min_age = _as_number(data.get("min_age"), "Minimum age", unresolved)
+    max_age = _as_number(data.get("max_age"), "Maximum age", unresolved)
+    min_education = data.get("min_education")
+    if min_education is not None and min_education not in EDUCATION_LEVELS[:-1]:
+        unresolved.append(f"Education: {min_education}")
+        min_education = None
+
+    return EligibilityRules(
+        min_age=int(min_age) if min_age is not None else None,
+        max_age=int(max_age) if max_age is not None else None,
+        max_annual_income=_as_number(data.get("max_annual_income"), "Income limit", unresolved),
+        genders=_pick(data.get("genders"), GENDERS[:2], "Gender", unresolved),
+        categories=_pick(data.get("categories"), CATEGORIES, "Category", unresolved),
+        states=_pick(data.get("states"), STATES[:-1], "State", unresolved),
+        occupations=_pick(data.get("occupations"), OCCUPATIONS[:-1], "Occupation", unresolved),
+        min_education=min_education,
+        unresolved_criteria=unresolved,
+    )
+
+
+def compile_eligibility_rules(client, summary: str) -> EligibilityRules:
+    """One structured-output call per scheme that turns the summary's criteria into EligibilityRules"""
+    response = client.chat.completions.create(
+        model="gpt-4o-mini",
+        messages=[{"role": "user", "content": RULES_PROMPT.format(summary=summary)}],
+        temperature=0,
+        response_format={
+            "type": "json_schema",
+            "json_schema": {"name": "eligibility_rules", "strict": True, "schema": RULES_SCHEMA},
+        },
+    )
+    return parse_rules(json.loads(response.choices[0].message.content))
+
+
+# (criterion label, profile key, EligibilityRules attribute) for list-valued criteria
+MEMBERSHIP_CRITERIA = (
+    ("Gender", "gender", "genders"),
+    ("Category", "category", "categories"),
+    ("State", "state", "states"),
+    ("Occupation", "occupation", "occupations"),
+)
+
+
+def age_bounds(rules: EligibilityRules) -> Tuple[int, int]:
+    low = rules.min_age if rules.min_age is not None else 0
+    high = rules.max_age if rules.max_age is not None else 200
+    return low, high
+
+
+def check_age(rules: EligibilityRules, age: Optional[int]) -> RuleCheck:
+    low, high = age_bounds(rules)
+    if age is None:
+        return RuleCheck("Age", UNKNOWN, "age not given")
+    if low <= age <= high:
+        return RuleCheck("Age", PASS, f"{age} is within {low}-{high}")
+    return RuleCheck("Age", FAIL, f"{age} is outside {low}-{high}")
+
+
+def check_income(rules: EligibilityRules, income: Optional[str]) -> RuleCheck:
+    ceiling = rules.max_annual_income
+    low, high = INCOME_RANGES.get(income, (None, None))
+    if low is None:
+        return RuleCheck("Income", UNKNOWN, "income not given")
+    if high <= ceiling:
+        return RuleCheck("Income", PASS, f"{income} is within the ₹{ceiling:,.0f} limit")
+    if low >= ceiling:
+        return RuleCheck("Income", FAIL, f"{income} is above the ₹{ceiling:,.0f} limit")
+    return RuleCheck("Income", UNKNOWN, f"{income} straddles the ₹{ceiling:,.0f} limit")
+
+
+def check_membership(criterion: str, value: str, allowed: List[str]) -> RuleCheck:
+    if value in allowed:
+        return RuleCheck(criterion, PASS, f"{value} is covered")
+    if value in _UNSPECIFIED or not value:
+        return RuleCheck(criterion, UNKNOWN, f"scheme is limited to {', '.join(allowed)}")
+    return RuleCheck(criterion, FAIL, f"{value} is not covered (only {', '.join(allowed)})")
+
+
+def check_education(rules: EligibilityRules, education: Optional[str]) -> RuleCheck:
+    if education in _UNSPECIFIED or education not in EDUCATION_LEVELS:
+        return RuleCheck("Education", UNKNOWN, f"minimum is {rules.min_education}")
+    if EDUCATION_LEVELS.index(education) >= EDUCATION_LEVELS.index(rules.min_education):
+        return RuleCheck("Education", PASS, f"{education} meets {rules.min_education}")
+    return RuleCheck("Education", FAIL, f"{education} is below {rules.min_education}")
+
+
+def evaluate_rules(rules: EligibilityRules, profile: Dict) -> EligibilityResult:
+    """Evaluate a get_user_profile()-shaped dict against compiled rules without any network call"""
+    checks = []
+
+    if rules.min_age is not None or rules.max_age is not None:
+        checks.append(check_age(rules, profile.get("age")))
+
+    if rules.max_annual_income is not None:
+        checks.append(check_income(rules, profile.get("income")))
+
+    for criterion, key, attribute in MEMBERSHIP_CRITERIA:
+        allowed = getattr(rules, attribute)
+        if allowed:
+            checks.append(check_membership(criterion, profile.get(key, "Other"), allowed))
+
+    if rules.min_education:
+        checks.append(check_education(rules, profile.get("education", "Others")))
+
+    return EligibilityResult(checks, list(rules.unresolved_criteria))
+
+
+def render_eligibility(result: EligibilityResult) -> str:
+    """Markdown in the same layout as the LLM eligibility response"""
+    icons = {PASS: "✅", FAIL: "❌", UNKNOWN: "❔"}
+    lines = [f"**ELIGIBILITY STATUS:** {result.status or 'PARTIALLY ELIGIBLE'}", "", "**EXPLANATION:**"]
+    lines += [f"{icons[c.outcome]} **{c.criterion}:** {c.detail}" for c in result.checks]
+    lines += [f"❔ {criterion}" for criterion in result.unresolved_criteria]
+
+    if result.failed:
+        lines += ["", "**IF NOT ELIGIBLE - STEPS TO BECOME ELIGIBLE:**"]
+        lines += [f"{i}. {c.criterion}: {c.detail}" for i, c in enumerate(result.failed, 1)]
+
+    lines += ["", "**NEXT STEPS:**"]
+    if result.failed:
+        lines.append("Look for related schemes that match your profile, or re-check once your situation changes.")
+    else:
+        lines.append("Follow the application process in the scheme summary above.")
+    lines += ["", "**REQUIRED DOCUMENTATION:**", "See the required documents listed in the scheme summary above."]
+    return "\n".join(lines)
@@ -1,17 +1,55 @@
 import streamlit as st
-import fitz  # PyMuPDF
 from openai import OpenAI
 import os
-from deep_translator import GoogleTranslator
-import re
 import json
-from typing import Dict, List, Optional
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
+import io
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from bulk_screening import PROFILE_FIELDS, screen_csv
+from caching import LRUCache, SQLiteCache, TieredCache, content_digest
+from eligibility_rules import (
+    CATEGORIES, EDUCATION_LEVELS, GENDERS, INCOME_BRACKETS, OCCUPATIONS, STATES,
+    EligibilityRules, compile_eligibility_rules, evaluate_rules, render_eligibility,
+)
+from languages import LLM, Language, MultilingualTranslator, Translation, enabled_languages
+from llm_client import CachedOpenAIClient, RateLimitedOpenAIClient, ResilientOpenAIClient
+from pdf_extraction import (
+    ExtractionCache, PageRecord, fit_pages_to_budget, format_pages, formatted_token_count, parse_pages, split_into_chunks,
+)
+from prompts import (
+    SUMMARY_INPUT_TOKENS, chunk_summary_prompt, eligibility_prompt, label_partial, reduce_summary_prompt,
+    scheme_summary_prompt,
+)
+from rate_limit import get_default_limiter
+from relevance import relevant_excerpt
+from resilience import HEDGE_REQUESTS, REQUEST_TIMEOUT
+from scheme_record import (
+    STRUCTURED_SUMMARY, SchemeRecord, eligibility_details, extract_scheme_record, render_scheme_markdown,
+)
+from scheme_store import SchemeStore
+from single_flight import SingleFlight, SQLiteLease
+from translation import batch_stats
+from translation_backends import BackendPool
+from translation_memory import TranslationMemory
 
 # 🆕 NEW: Added logging for better debugging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# 🆕 NEW: Process-wide LLM response cache (memory LRU + optional SQLite tier under MYGOV_CACHE_DIR)
+@st.cache_resource
+def get_response_cache() -> TieredCache:
+    """Shared cache of chat completions keyed by model, messages and parameters"""
+    ttl = 7 * 24 * 3600
+    cache_dir = os.getenv("MYGOV_CACHE_DIR")
+    disk = None
+    if cache_dir:
+        os.makedirs(cache_dir, exist_ok=True)
+        disk = SQLiteCache(os.path.join(cache_dir, "llm_responses.sqlite3"), ttl=ttl)
+    return TieredCache(LRUCache(max_entries=512, ttl=ttl), disk)
+
 # 🔧 IMPROVED: Better API key handling with caching and error checking
 @st.cache_resource
 def get_openai_client():
@@ -20,23 +58,67 @@ def get_openai_client():
     if not api_key:
         st.error("❌ OpenAI API key not found. Please add it to your secrets.")
         st.stop()
-    return OpenAI(api_key=api_key)
+    # Cache hits never touch the API; every retry or hedge attempt is rate limited.
+    # The SDK's own retries are off because ResilientOpenAIClient classifies and backs off itself.
+    limited = RateLimitedOpenAIClient(
+        OpenAI(api_key=api_key, max_retries=0, timeout=REQUEST_TIMEOUT), get_default_limiter()
+    )
+    resilient = ResilientOpenAIClient(limited, hedge=HEDGE_REQUESTS)
+    return CachedOpenAIClient(resilient, get_response_cache())
+
+# 🆕 NEW: Process-wide extraction cache so widget reruns don't re-parse the same PDF
+@st.cache_resource
+def get_extraction_cache() -> ExtractionCache:
+    """Shared in-memory extraction cache; pages persist in the scheme store"""
+    return ExtractionCache(max_entries=32)
+
+# 🆕 NEW: Knowledge base of analyzed documents shared by every user (SQLite file under MYGOV_CACHE_DIR)
+@st.cache_resource
+def get_scheme_store() -> SchemeStore:
+    """Pages, structured summaries and translations keyed by document digest"""
+    cache_dir = os.getenv("MYGOV_CACHE_DIR")
+    if not cache_dir:
+        # Process memory: records and translations only (get_pdf_pages skips it), and few of them
+        return SchemeStore(max_documents=256)
+    os.makedirs(cache_dir, exist_ok=True)
+    return SchemeStore(os.path.join(cache_dir, "schemes.sqlite3"))
+
+# 🆕 NEW: Identical documents analyzed at the same time share one computation per stage
+@st.cache_resource
+def get_single_flight() -> SingleFlight:
+    """Process-wide in-flight registry; with MYGOV_CACHE_DIR, processes also take turns via a lease file"""
+    cache_dir = os.getenv("MYGOV_CACHE_DIR")
+    lease = None
+    if cache_dir:
+        # Waiting processes rerun the stage against the shared SQLite response cache
+        os.makedirs(cache_dir, exist_ok=True)
+        lease = SQLiteLease(os.path.join(cache_dir, "leases.sqlite3"))
+    # A leader slower than one timed-out attempt plus a retry is most likely hung; waiters then compute themselves
+    return SingleFlight(lease, wait_timeout=2 * REQUEST_TIMEOUT)
+
+# 🆕 NEW: Page-level extraction so later stages can work per page instead of re-splitting markers
+def get_pdf_pages(uploaded_file) -> List[PageRecord]:
+    """Extract non-blank pages from the PDF, served from the caches or the scheme store when possible"""
+    pdf_bytes = uploaded_file.getvalue()
+    digest = content_digest(pdf_bytes)
+    cache = get_extraction_cache()
+    pages = cache.get(digest)
+    if pages is None:
+        # Without a disk path, pages stay bounded by the 32-entry extraction cache alone
+        store = get_scheme_store()
+        pages = store.get_pages(digest) if store.persistent else None
+        if pages is None:
+            pages = cache.get_or_extract(pdf_bytes)
+            if store.persistent:
+                store.put_pages(digest, pages)
+        cache.set(digest, pages)
+    return pages
 
 # 🔧 IMPROVED: Better PDF text extraction with proper error handling
 def extract_pdf_text(uploaded_file) -> str:
     """Extract text from PDF with improved error handling"""
     try:
-        pdf_document = fitz.open(stream=uploaded_file.read(), filetype="pdf")
-        text = ""
-        
-        for page_num in range(len(pdf_document)):
-            page = pdf_document[page_num]
-            page_text = page.get_text(sort=True)
-            if page_text.strip():
-                text += f"\n--- Page {page_num + 1} ---\n"
-                text += page_text
-        
-        pdf_document.close()
+        text = format_pages(get_pdf_pages(uploaded_file))
         
         if not text.strip():
             st.warning("⚠️ No text found in the PDF. This might be a scanned document that requires OCR.")
@@ -49,51 +131,59 @@ def extract_pdf_text(uploaded_file) -> str:
         st.error(f"❌ Error reading PDF: {str(e)}")
         return ""
 
-# 🆕 NEW: Comprehensive scheme analysis function
-def get_scheme_summary(client, text: str, max_chars: int = 10000) -> str:
-    """Generate a comprehensive summary of the government scheme"""
+# 🆕 NEW: Streaming helper so users see tokens as they are generated
+def stream_completion(client, build_prompt: Callable[[], str], temperature: float, error_label: str) -> Iterator[str]:
+    """Yield completion text as it arrives; errors are yielded as text like the non-streaming paths"""
     try:
-        if len(text) > max_chars:
-            text = text[:max_chars]
-            last_period = text.rfind('.')
-            if last_period > max_chars * 0.8:
-                text = text[:last_period + 1]
-        
-        prompt = f"""
-        You are an expert government policy analyst. Analyze this government scheme document and provide a comprehensive summary in the following format:
-
-        **SCHEME NAME:** [Name of the scheme]
-
-        **PURPOSE:** [What this scheme aims to achieve]
-
-        **KEY BENEFITS:**
-        • [Benefit 1]
-        • [Benefit 2]
-        • [Benefit 3]
-
-        **ELIGIBILITY CRITERIA:**
-        • [Criterion 1]
-        • [Criterion 2]
-        • [Criterion 3]
+        stream = client.chat.completions.create(
+            model="gpt-4o-mini",
+            messages=[{"role": "user", "content": build_prompt()}],
+            temperature=temperature,
+            stream=True
+        )
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+    
+    except Exception as e:
+        logger.error(f"{error_label}: {str(e)}")
+        yield f"{error_label}: {str(e)}"
 
-        **REQUIRED DOCUMENTS:**
-        • [Document 1]
-        • [Document 2]
-        • [Document 3]
+def _scheme_summary_prompt(
+    client, text: str, max_tokens: int, long_document: str, pages: Optional[List[PageRecord]] = None
+) -> str:
+    pages = pages if pages is not None else parse_pages(text)
+    if long_document == "map_reduce" and formatted_token_count(pages) > max_tokens:
+        return _map_reduce_prompt(client, text)
+    if long_document == "truncate":
+        return scheme_summary_prompt(fit_pages_to_budget(pages, max_tokens))
+    return scheme_summary_prompt(_document_excerpt(pages, max_tokens))
 
-        **APPLICATION PROCESS:**
-        1. [Step 1]
-        2. [Step 2]
-        3. [Step 3]
+def _document_excerpt(pages: List[PageRecord], max_tokens: int) -> str:
+    # Budget in model tokens from the cached per-page counts; characters mislead for Indic scripts
+    if formatted_token_count(pages) <= max_tokens:
+        return fit_pages_to_budget(pages, max_tokens)
+    # One pass over the passages that best match each summary section
+    return relevant_excerpt(pages, max_tokens)
 
-        **IMPORTANT DETAILS:**
-        • Application deadline: [if mentioned]
-        • Contact information: [if mentioned]
-        • Subsidy/benefit amount: [if mentioned]
+# 🆕 NEW: Comprehensive scheme analysis function
+def get_scheme_summary(
+    client, text: str, max_tokens: int = SUMMARY_INPUT_TOKENS, long_document: str = "select", stream: bool = False,
+    pages: Optional[List[PageRecord]] = None
+) -> Union[str, Iterator[str]]:
+    """Generate a comprehensive summary of the government scheme (a token iterator when stream=True).
 
-        Document content:
-        {text}
-        """
+    Documents over max_tokens are handled by long_document: "select" (BM25-ranked passages),
+    "map_reduce" (summarize every chunk, then merge) or "truncate" (leading pages only).
+    """
+    if stream:
+        return stream_completion(
+            client, lambda: _scheme_summary_prompt(client, text, max_tokens, long_document, pages),
+            0.3, "Error generating summary"
+        )
+    
+    try:
+        prompt = _scheme_summary_prompt(client, text, max_tokens, long_document, pages)
         
         response = client.chat.completions.create(
             model="gpt-4o-mini",
@@ -107,47 +197,89 @@ def get_scheme_summary(client, text: str, max_chars: int = 10000) -> str:
         logger.error(f"Error generating summary: {str(e)}")
         return f"Error generating summary: {str(e)}"
 
-# 🆕 NEW: Eligibility checking function
-def check_eligibility(client, summary: str, user_profile: Dict) -> str:
-    """Check user eligibility based on the scheme and user profile"""
-    try:
-        profile_text = f"""
-        Age: {user_profile.get('age', 'Not specified')}
-        Gender: {user_profile.get('gender', 'Not specified')}
-        Income: {user_profile.get('income', 'Not specified')}
-        Category: {user_profile.get('category', 'Not specified')}
-        State: {user_profile.get('state', 'Not specified')}
-        Occupation: {user_profile.get('occupation', 'Not specified')}
-        Education: {user_profile.get('education', 'Not specified')}
-        """
-        
-        prompt = f"""
-        Based on the government scheme details and user profile below, determine eligibility and provide guidance.
-
-        SCHEME DETAILS:
-        {summary}
-
-        USER PROFILE:
-        {profile_text}
+# 🆕 NEW: Concurrent uploads of the same PDF wait on one summary instead of each calling the API
+def get_scheme_summary_shared(
+    client, doc_digest: str, text: str, pages: Optional[List[PageRecord]] = None, stream: bool = False
+) -> Union[str, Iterator[str]]:
+    """get_scheme_summary(), coalesced with in-flight requests for the same document"""
+    key = f"summary:{doc_digest}"
+    if stream:
+        return get_single_flight().stream(key, lambda: get_scheme_summary(client, text, stream=True, pages=pages))
+    return get_single_flight().do(key, lambda: get_scheme_summary(client, text, pages=pages))
 
-        Provide a response in this format:
+# 🆕 NEW: Structured scheme record, validated once per document and rendered to markdown locally
+def get_scheme_record(
+    client, doc_digest: str, text: str, pages: Optional[List[PageRecord]] = None, max_tokens: int = SUMMARY_INPUT_TOKENS
+) -> SchemeRecord:
+    """The document's SchemeRecord from the scheme store, extracted with one structured-output call on a miss"""
+    store = get_scheme_store()
+    record = store.get_record(doc_digest)
+    if record is None:
+        pages = pages if pages is not None else parse_pages(text)
+        record = get_single_flight().do(
+            f"record:{doc_digest}", lambda: extract_scheme_record(client, _document_excerpt(pages, max_tokens))
+        )
+        store.put_record(doc_digest, record)
+    return record
 
-        **ELIGIBILITY STATUS:** [ELIGIBLE/NOT ELIGIBLE/PARTIALLY ELIGIBLE]
+# 🆕 NEW: Map-reduce summarization (long_document="map_reduce") so long documents aren't silently truncated
+def _summarize_chunk(client, chunk: str, part: int, total: int) -> str:
+    response = client.chat.completions.create(
+        model="gpt-4o-mini",
+        messages=[{"role": "user", "content": chunk_summary_prompt(chunk, part, total)}],
+        temperature=0.3
+    )
+    return response.choices[0].message.content
 
-        **EXPLANATION:**
-        [Detailed explanation of why they are or aren't eligible]
+def _map_reduce_prompt(client, text: str, chunk_tokens: int = 3000, max_workers: int = 4) -> str:
+    """Run the map step concurrently and build the reduce prompt from the partial summaries"""
+    chunks = split_into_chunks(text, max_tokens=chunk_tokens)
+    total = len(chunks)
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = [pool.submit(_summarize_chunk, client, chunk, i + 1, total) for i, chunk in enumerate(chunks)]
+        partials = []
+        for i, future in enumerate(futures):
+            try:
+                partials.append(label_partial(future.result(), i + 1, total))
+            except Exception as e:
+                logger.error(f"Error summarizing part {i + 1} of {total}: {str(e)}")
+    
+    if not partials:
+        raise RuntimeError("all document parts failed to summarize")
+    
+    return reduce_summary_prompt(partials)
 
-        **IF NOT ELIGIBLE - STEPS TO BECOME ELIGIBLE:**
-        1. [Step 1 if applicable]
-        2. [Step 2 if applicable]
-        3. [Step 3 if applicable]
 
-        **NEXT STEPS:**
-        [What the user should do next to apply or become eligible]
+# 🆕 NEW: Structured summary first, with the streamed free-form summary as the fallback
+def render_scheme_summary(client, doc_digest: str, text: str, pages: List[PageRecord]) -> Tuple[str, str]:
+    """Show the English summary; returns (summary markdown, scheme details for eligibility checks)"""
+    if STRUCTURED_SUMMARY:
+        try:
+            with st.spinner("📝 Analyzing scheme document..."):
+                record = get_scheme_record(client, doc_digest, text, pages)
+            summary = render_scheme_markdown(record)
+            st.markdown(summary)
+            # Without extracted criteria the full summary is the better context for the model
+            return summary, eligibility_details(record) if record.eligibility_criteria else summary
+        except Exception as e:
+            logger.warning(f"Structured summary unavailable, streaming a free-form one: {str(e)}")
+    
+    with st.spinner("📝 Analyzing scheme document..."):
+        summary = st.write_stream(get_scheme_summary_shared(client, doc_digest, text, pages=pages, stream=True))
+    return summary, summary
 
-        **REQUIRED DOCUMENTATION:**
-        [List documents they need to gather based on their profile]
-        """
+# 🆕 NEW: Eligibility checking function
+def check_eligibility(client, summary: str, user_profile: Dict, stream: bool = False) -> Union[str, Iterator[str]]:
+    """Check user eligibility based on the scheme and user profile (a token iterator when stream=True)"""
+    if stream:
+        return stream_completion(
+            client, lambda: eligibility_prompt(summary, user_profile),
+            0.2, "Error checking eligibility"
+        )
+    
+    try:
+        prompt = eligibility_prompt(summary, user_profile)
         
         response = client.chat.completions.create(
             model="gpt-4o-mini",
@@ -161,63 +293,169 @@ def check_eligibility(client, summary: str, user_profile: Dict) -> str:
         logger.error(f"Error checking eligibility: {str(e)}")
         return f"Error checking eligibility: {str(e)}"
 
-# 🔧 IMPROVED: Much better Hindi translation using GPT
-def translate_to_hindi(client, text: str) -> str:
-    """Translate to simple Hindi using GPT for better context understanding"""
+# 🆕 NEW: Compiled eligibility rules, one compile per scheme summary shared by all sessions
+@st.cache_resource
+def get_rules_cache() -> LRUCache:
+    """Compiled EligibilityRules keyed by summary digest"""
+    return LRUCache(max_entries=256)
+
+def get_eligibility_rules(client, summary: str) -> EligibilityRules:
+    """Compile the summary's criteria into local rules, reusing earlier compiles"""
+    cache = get_rules_cache()
+    key = content_digest(summary.encode("utf-8"))
+    rules = cache.get(key)
+    if rules is None:
+        rules = get_single_flight().do(f"rules:{key}", lambda: compile_eligibility_rules(client, summary))
+        cache.set(key, rules)
+    return rules
+
+# 🆕 NEW: Local rule evaluation first; the LLM is only asked when the rules can't decide
+def check_eligibility_fast(client, summary: str, user_profile: Dict, stream: bool = False) -> Union[str, Iterator[str]]:
+    """Check eligibility locally from compiled rules, falling back to check_eligibility()"""
     try:
-        prompt = f"""
-        Translate the following government scheme information to very simple Hindi that a common person, farmer, or villager can easily understand. 
-        Use simple words and avoid complex technical terms. Make it conversational and easy to understand.
-        
-        Text to translate:
-        {text}
-        """
-        
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.3
+        rules = get_eligibility_rules(client, summary)
+        if rules.has_formal_criteria:
+            result = evaluate_rules(rules, user_profile)
+            if result.is_conclusive:
+                verdict = render_eligibility(result)
+                return iter([verdict]) if stream else verdict
+    except Exception as e:
+        logger.warning(f"Local eligibility rules unavailable, asking the model: {str(e)}")
+    return check_eligibility(client, summary, user_profile, stream=stream)
+
+# 🆕 NEW: Sentence-level translation memory shared by all users (SQLite file under MYGOV_CACHE_DIR)
+@st.cache_resource
+def get_translation_memory() -> TranslationMemory:
+    """Exact and fuzzy reuse of earlier sentence translations, consulted before any network call"""
+    cache_dir = os.getenv("MYGOV_CACHE_DIR")
+    if not cache_dir:
+        return TranslationMemory()
+    os.makedirs(cache_dir, exist_ok=True)
+    return TranslationMemory(os.path.join(cache_dir, "translation_memory.sqlite3"))
+
+# 🆕 NEW: Long-lived, keep-alive translation sessions per target language shared by all users
+@st.cache_resource
+def get_translation_backends() -> BackendPool:
+    """Pooled Google Translate sessions (pool size from MYGOV_TRANSLATE_POOL_SIZE)"""
+    return BackendPool()
+
+# 🆕 NEW: Every registered language goes through one translator; see languages.py to add one
+@st.cache_resource
+def get_multilingual_translator() -> MultilingualTranslator:
+    """Concurrent fan-out to the enabled languages over the shared backends and translation memory"""
+    return MultilingualTranslator(get_openai_client(), get_translation_backends(), get_translation_memory())
+
+# 🆕 NEW: The summary is identical for every user, so its translation is stored once per language
+def translate_summary_cached(
+    doc_digest: str, summary: str, language: str, translate: Callable[[str], Translation]
+) -> str:
+    """Translate the profile-independent summary, reusing the stored translation of the same summary text"""
+    store = get_scheme_store()
+    source_digest = content_digest(summary.encode("utf-8"))
+    translated = store.get_translation(doc_digest, language, source_digest)
+    if translated is None:
+        result = get_single_flight().do(f"translation:{language}:{source_digest}", lambda: translate(summary))
+        # Errors and partly untranslated text are shown but never stored, so a later run retries them
+        if result.complete:
+            store.put_translation(doc_digest, language, source_digest, result.text)
+        translated = result.text
+    return translated
+
+# 🆕 NEW: LLM languages share one combined call for the summary, the bulk of the text to translate
+def translate_summaries_cached(doc_digest: str, summary: str, languages: List[Language]) -> Dict[str, str]:
+    """translate_summary_cached for several languages: those not stored yet go through one submit_many call"""
+    store = get_scheme_store()
+    source_digest = content_digest(summary.encode("utf-8"))
+    results = {}
+    missing = []
+    for language in languages:
+        stored = store.get_translation(doc_digest, language.namespace, source_digest)
+        if stored is None:
+            missing.append(language)
+        else:
+            results[language.code] = stored
+    
+    def translate_missing() -> Dict[str, str]:
+        translated = get_multilingual_translator().translate_many(summary, missing)
+        for language in missing:
+            if translated[language.code].complete:
+                store.put_translation(doc_digest, language.namespace, source_digest, translated[language.code].text)
+        return {code: result.text for code, result in translated.items()}
+    
+    if missing:
+        key = f"translation:{'+'.join(language.namespace for language in missing)}:{source_digest}"
+        results.update(get_single_flight().do(key, translate_missing))
+    return results
+
+def _translate_summary_and_eligibility(
+    summary_job: Callable[[], str], eligibility_job: Callable[[], str], heading: str
+) -> str:
+    """Run the (usually cached) summary translation alongside the per-user eligibility translation"""
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        summary_future = pool.submit(summary_job)
+        translated_eligibility = eligibility_job()
+        return f"{summary_future.result()}\n\n{heading}\n{translated_eligibility}"
+
+# 🆕 NEW: One stage per enabled language (MYGOV_LANGUAGES); languages are declared in languages.py
+def get_translation_stages(client, summary: str, eligibility: str, doc_digest: str) -> List[Dict]:
+    """Describe each translation stage: column title, waiting message and the work to run.
+
+    The per-user eligibility text is sent to every language at once, sharing one segmentation.
+    In combined mode the summary of all LLM languages is one call too; their stages share it.
+    """
+    translator = get_multilingual_translator()
+    languages = enabled_languages()
+    eligibility_jobs = translator.submit_many(eligibility, languages)
+    llm_languages = [language for language in languages if language.backend == LLM]
+    combined = translator.llm_mode == "combined" and len(llm_languages) > 1
+    
+    def summary_job(language: Language) -> Callable[[], str]:
+        if combined and language in llm_languages:
+            return lambda: translate_summaries_cached(doc_digest, summary, llm_languages)[language.code]
+        return lambda: translate_summary_cached(
+            doc_digest, summary, language.namespace, lambda text: translator.translate(text, language)
         )
-        
-        return response.choices[0].message.content
     
-    except Exception as e:
-        logger.error(f"Error translating to Hindi: {str(e)}")
-        try:
-            paragraphs = text.split('\n\n')
-            translated_paragraphs = []
-            
-            for paragraph in paragraphs:
-                if paragraph.strip():
-                    translated = GoogleTranslator(source='auto', target='hi').translate(paragraph)
-                    translated_paragraphs.append(translated)
-            
-            return '\n\n'.join(translated_paragraphs)
-        except:
-            return f"Translation error: {str(e)}"
+    return [
+        {
+            "title": language.title,
+            "pending": language.pending,
+            "run": lambda language=language: _translate_summary_and_eligibility(
+                summary_job(language),
+                lambda: eligibility_jobs[language.code].result().text,
+                language.eligibility_heading,
+            ),
+        }
+        for language in languages
+    ]
 
-# 🔧 IMPROVED: Better Telugu translation with sentence-by-sentence processing
-def translate_to_telugu(text: str) -> str:
-    """Translate to Telugu using improved chunking"""
-    try:
-        sentences = re.split(r'[.!?]+', text)
-        translated_sentences = []
-        
-        for sentence in sentences:
-            sentence = sentence.strip()
-            if sentence and len(sentence) > 2:
-                try:
-                    translated = GoogleTranslator(source='auto', target='te').translate(sentence)
-                    if translated:
-                        translated_sentences.append(translated)
-                except:
-                    translated_sentences.append(sentence)
-        
-        return '. '.join(translated_sentences)
+# 🆕 NEW: Run translation stages concurrently and render each column as soon as it finishes
+def render_translation_stages(stages: List[Dict]) -> Dict[str, str]:
+    """Run every stage on a thread pool; total latency is the slowest stage, not the sum"""
+    columns = st.columns(len(stages))
+    placeholders = []
+    for column, stage in zip(columns, stages):
+        with column:
+            st.subheader(stage["title"])
+            placeholder = st.empty()
+            placeholder.info(f"⏳ {stage['pending']}")
+            placeholders.append(placeholder)
     
-    except Exception as e:
-        logger.error(f"Error translating to Telugu: {str(e)}")
-        return f"Translation error: {str(e)}"
+    results = {}
+    # Workers only run the translation callables; all st.* calls stay on the script thread
+    with ThreadPoolExecutor(max_workers=len(stages)) as pool:
+        futures = {pool.submit(stage["run"]): i for i, stage in enumerate(stages)}
+        for future in as_completed(futures):
+            i = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                logger.error(f"Error in translation stage {stages[i]['title']}: {str(e)}")
+                result = f"Translation error: {str(e)}"
+            placeholders[i].markdown(result)
+            results[stages[i]["title"]] = result
+    
+    return results
 
 # 🆕 NEW: User profile collection function
 def get_user_profile() -> Dict:
@@ -228,29 +466,14 @@ def get_user_profile() -> Dict:
     
     with col1:
         age = st.number_input("Age", min_value=0, max_value=120, value=25)
-        gender = st.selectbox("Gender", ["Male", "Female", "Other", "Prefer not to say"])
-        income = st.selectbox("Annual Income", [
-            "Below ₹1 Lakh", "₹1-3 Lakhs", "₹3-5 Lakhs", 
-            "₹5-10 Lakhs", "₹10-20 Lakhs", "Above ₹20 Lakhs"
-        ])
-        category = st.selectbox("Category", ["General", "OBC", "SC", "ST", "EWS"])
+        gender = st.selectbox("Gender", GENDERS)
+        income = st.selectbox("Annual Income", INCOME_BRACKETS)
+        category = st.selectbox("Category", CATEGORIES)
     
     with col2:
-        state = st.selectbox("State", [
-            "Andhra Pradesh", "Telangana", "Tamil Nadu", "Karnataka", "Kerala",
-            "Maharashtra", "Gujarat", "Rajasthan", "Uttar Pradesh", "Bihar",
-            "West Bengal", "Odisha", "Madhya Pradesh", "Chhattisgarh", "Jharkhand",
-            "Haryana", "Punjab", "Himachal Pradesh", "Uttarakhand", "Delhi",
-            "Other"
-        ])
-        occupation = st.selectbox("Occupation", [
-            "Farmer", "Student", "Government Employee", "Private Employee",
-            "Self-employed", "Business Owner", "Unemployed", "Retired", "Other"
-        ])
-        education = st.selectbox("Education", [
-            "Primary School", "High School", "Intermediate", "Graduate",
-            "Post Graduate", "Professional Degree", "Others"
-        ])
+        state = st.selectbox("State", STATES)
+        occupation = st.selectbox("Occupation", OCCUPATIONS)
+        education = st.selectbox("Education", EDUCATION_LEVELS)
     
     return {
         "age": age,
@@ -262,6 +485,60 @@ def get_user_profile() -> Dict:
         "education": education
     }
 
+# 🆕 NEW: Bulk screening of many beneficiary profiles against the analyzed scheme
+def render_bulk_screening(client, summary: str):
+    """Screen an uploaded CSV of profiles with the compiled rules and offer the results as CSV"""
+    with st.expander("🏢 Bulk Eligibility Screening (CSV)", expanded=False):
+        st.caption(f"CSV columns: {', '.join(PROFILE_FIELDS)} (any extra columns are kept)")
+        profiles_csv = st.file_uploader("Upload beneficiary profiles", type=["csv"], key="bulk_profiles")
+        
+        if profiles_csv and st.button("🔎 Screen Profiles"):
+            try:
+                with st.spinner("Screening profiles..."):
+                    rules = get_eligibility_rules(client, summary)
+                    results = io.StringIO()
+                    counts = screen_csv(rules, io.TextIOWrapper(profiles_csv, encoding="utf-8-sig"), results)
+            except Exception as e:
+                logger.error(f"Error screening profiles: {str(e)}")
+                st.error(f"❌ Could not screen profiles: {str(e)}")
+                return
+            
+            st.write(" | ".join(f"**{status}:** {count}" for status, count in counts.items()))
+            if not rules.has_formal_criteria:
+                st.warning("⚠️ No checkable criteria were found in this scheme, so every profile needs manual review.")
+            elif rules.unresolved_criteria:
+                st.caption("Needs manual review: " + "; ".join(rules.unresolved_criteria))
+            st.download_button(
+                "⬇️ Download Results",
+                results.getvalue(),
+                file_name="eligibility_results.csv",
+                mime="text/csv"
+            )
+
+# 🆕 NEW: Operational metrics for whoever runs the deployment
+def render_service_metrics():
+    """Sidebar view of the shared caches and the OpenAI rate limiter queue"""
+    with st.sidebar.expander("📊 Service Metrics", expanded=False):
+        st.caption("OpenAI rate limiter (queue wait)")
+        st.json(get_default_limiter().stats())
+        st.caption("OpenAI retries, circuit breaker and hedging")
+        # Resolved through CachedOpenAIClient's delegation to the resilient layer
+        st.json(get_openai_client().resilience_stats())
+        st.caption("In-flight request coalescing")
+        st.json(get_single_flight().stats())
+        st.caption("LLM response cache")
+        st.json(get_response_cache().stats())
+        st.caption("PDF extraction cache")
+        st.json(get_extraction_cache().memory.stats())
+        st.caption("Scheme knowledge base")
+        st.json(get_scheme_store().stats())
+        st.caption("Translation memory")
+        st.json(get_translation_memory().stats())
+        st.caption("Translation backend sessions (round-trip latency)")
+        st.json(get_translation_backends().stats())
+        st.caption("Batched translation requests (batching starts once probe batches come back aligned)")
+        st.json(batch_stats.stats())
+
 # 🔧 IMPROVED: Better main function with enhanced UI
 def main():
     st.set_page_config(
@@ -275,6 +552,7 @@ def main():
     
     # Initialize OpenAI client
     client = get_openai_client()
+    render_service_metrics()
     
     # File upload
     uploaded_pdf = st.file_uploader(
@@ -285,6 +563,9 @@ def main():
     
     if uploaded_pdf:
         st.info(f"📎 Uploaded: {uploaded_pdf.name} ({uploaded_pdf.size} bytes)")
+        doc_digest = content_digest(uploaded_pdf.getvalue())
+        if STRUCTURED_SUMMARY and get_scheme_store().has_record(doc_digest):
+            st.caption("⚡ This scheme has been analyzed before; its summary is served from the knowledge base.")
         
         # Extract text
         with st.spinner("🔍 Extracting text from PDF..."):
@@ -299,42 +580,29 @@ def main():
             
             if st.button("🚀 Analyze Scheme & Check Eligibility", type="primary"):
                 
-                # Generate summary
-                with st.spinner("📝 Analyzing scheme document..."):
-                    summary = get_scheme_summary(client, text)
-                
-                # Display English summary
+                # Generate and display English summary
                 st.subheader("📋 Scheme Summary (English)")
-                st.markdown(summary)
+                summary, scheme_details = render_scheme_summary(client, doc_digest, text, get_pdf_pages(uploaded_pdf))
                 st.divider()
                 
-                # Check eligibility
-                with st.spinner("✅ Checking your eligibility..."):
-                    eligibility = check_eligibility(client, summary, user_profile)
-                
+                # Check eligibility against the compact scheme facts
                 st.subheader("🎯 Your Eligibility Status")
-                st.markdown(eligibility)
+                with st.spinner("✅ Checking your eligibility..."):
+                    eligibility = st.write_stream(check_eligibility_fast(client, scheme_details, user_profile, stream=True))
                 st.divider()
                 
-                # Translations
-                col1, col2 = st.columns(2)
-                
-                with col1:
-                    st.subheader("🇮🇳 हिंदी अनुवाद")
-                    with st.spinner("अनुवाद कर रहे हैं..."):
-                        combined_text = f"{summary}\n\n--- आपकी पात्रता ---\n{eligibility}"
-                        hindi_translation = translate_to_hindi(client, combined_text)
-                    st.markdown(hindi_translation)
-                
-                with col2:
-                    st.subheader("🇮🇳 తెలుగు అనువాదం")
-                    with st.spinner("అనువదిస్తున్నాము..."):
-                        combined_text = f"{summary}\n\n--- మీ అర్హత ---\n{eligibility}"
-                        telugu_translation = translate_to_telugu(combined_text)
-                    st.markdown(telugu_translation)
+                # Translations (all languages run concurrently; summary translations are reused across users)
+                render_translation_stages(get_translation_stages(client, summary, eligibility, doc_digest))
                 
                 st.success("✅ Analysis complete! Check the translations above for your language preference.")
                 
+                # Keep the scheme facts so bulk screening survives later reruns
+                st.session_state["scheme_summary"] = (doc_digest, scheme_details)
+            
+            saved = st.session_state.get("scheme_summary")
+            if saved and saved[0] == doc_digest:
+                render_bulk_screening(client, saved[1])
+                
         else:
             st.error("❌ Could not extract text from the PDF. Please ensure it's a text-based PDF, not a scanned image.")
 
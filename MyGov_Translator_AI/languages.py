@@ -0,0 +1,273 @@
+import json
+import logging
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from prompts import multi_translation_prompt, translation_prompt
+from segmentation import segment_markdown
+from translation import translate_segments
+from translation_backends import BackendPool
+from translation_memory import TranslationMemory
+
+logger = logging.getLogger(__name__)
+
+
+# Backends
+LLM = "llm"
+GOOGLE = "google"
+
+# Segmentation rules: "lines" sends whole lines; "sentences" splits each line's prose into sentences
+# (segmentation.py). Both keep the markdown layout.
+LINES = "lines"
+SENTENCES = "sentences"
+
+Segmented = Tuple[List[str], Callable[[List[str]], str]]
+
+# Codes translated by the LLM whatever backend they declare, e.g. "hi,te,ta"
+LLM_LANGUAGES = {code.strip() for code in os.getenv("MYGOV_LLM_LANGUAGES", "").split(",") if code.strip()}
+
+# How several LLM targets of the same text are translated: "combined" asks for all of them in one
+# structured-output call so the English input is paid once; "per_language" makes one call each,
+# which returns sooner (outputs generate in parallel) and caches each language on its own
+LLM_TRANSLATION = os.getenv("MYGOV_LLM_TRANSLATION", "combined")
+
+
+@dataclass(frozen=True)
+class Language:
+    """A target language: which backend translates it, how text is segmented for it and its UI strings"""
+    code: str
+    name: str
+    title: str
+    pending: str
+    eligibility_heading: str
+    backend: str = GOOGLE
+    segmentation: str = SENTENCES
+    # Key for translation memory entries and stored summary translations; defaults to code
+    cache_namespace: str = ""
+
+    @property
+    def namespace(self) -> str:
+        return self.cache_namespace or self.code
+
+
+@dataclass
+class Translation:
+    """Translated text; complete is False when the translation failed or some segments kept their source text"""
+    text: str
+    complete: bool = True
+
+
+LANGUAGES: Dict[str, Language] = {}
+
+
+def register_language(language: Language) -> Language:
+    if language.code in LLM_LANGUAGES:
+        language = replace(language, backend=LLM)
+    LANGUAGES[language.code] = language
+    return language
+
+
+def get_language(key: str) -> Language:
+    """Look a language up by code ("hi") or English name ("Hindi")"""
+    if key in LANGUAGES:
+        return LANGUAGES[key]
+    for language in LANGUAGES.values():
+        if language.name.casefold() == key.casefold():
+            return language
+    raise KeyError(f"Unknown language: {key}")
+
+
+# Hindi goes through the LLM for context-aware simple wording, with Google line by line as fallback
+register_language(Language(
+    "hi", "Hindi", "🇮🇳 हिंदी अनुवाद", "अनुवाद कर रहे हैं...", "--- आपकी पात्रता ---",
+    backend=LLM, segmentation=LINES,
+))
+register_language(Language("te", "Telugu", "🇮🇳 తెలుగు అనువాదం", "అనువదిస్తున్నాము...", "--- మీ అర్హత ---"))
+register_language(Language("ta", "Tamil", "🇮🇳 தமிழ் மொழிபெயர்ப்பு", "மொழிபெயர்க்கிறோம்...", "--- உங்கள் தகுதி ---"))
+register_language(Language("bn", "Bengali", "🇮🇳 বাংলা অনুবাদ", "অনুবাদ করা হচ্ছে...", "--- আপনার যোগ্যতা ---"))
+register_language(Language("mr", "Marathi", "🇮🇳 मराठी भाषांतर", "भाषांतर करत आहोत...", "--- तुमची पात्रता ---"))
+
+# Output columns in the app, by code and in order; checked here so a typo fails at startup, not per analysis
+ENABLED_LANGUAGES = [code.strip() for code in os.getenv("MYGOV_LANGUAGES", "hi,te").split(",") if code.strip()]
+_unknown = [code for code in ENABLED_LANGUAGES + sorted(LLM_LANGUAGES) if code not in LANGUAGES]
+if _unknown:
+    raise ValueError(
+        f"Unknown language codes in MYGOV_LANGUAGES/MYGOV_LLM_LANGUAGES: {', '.join(_unknown)} "
+        f"(registered: {', '.join(LANGUAGES)})"
+    )
+
+
+def resolve_languages(languages: Sequence[Union[str, Language]]) -> List[Language]:
+    return [language if isinstance(language, Language) else get_language(language) for language in languages]
+
+
+def enabled_languages() -> List[Language]:
+    return [get_language(code) for code in ENABLED_LANGUAGES]
+
+
+# --- Segmentation ---
+
+def _segment_lines(text: str) -> Segmented:
+    lines = text.split('\n')
+    content = [line for line in lines if line.strip()]
+
+    def join(translated: List[str]) -> str:
+        parts = iter(translated)
+        return '\n'.join(next(parts) if line.strip() else line for line in lines)
+
+    return content, join
+
+
+SEGMENTERS: Dict[str, Callable[[str], Segmented]] = {
+    LINES: _segment_lines,
+    SENTENCES: segment_markdown,
+}
+
+
+def segment_text(text: str, rule: str) -> Segmented:
+    """Translatable segments of text, plus a function that reassembles their translations"""
+    try:
+        return SEGMENTERS[rule](text)
+    except KeyError:
+        raise ValueError(f"Unknown segmentation rule: {rule}") from None
+
+
+# --- One-shot LLM translation ---
+
+def combined_translation_schema(codes: Sequence[str]) -> Dict:
+    """Strict structured-output schema: one required string per language code"""
+    return {
+        "type": "object",
+        "properties": {code: {"type": "string"} for code in codes},
+        "required": list(codes),
+        "additionalProperties": False,
+    }
+
+
+def parse_combined_translation(data: Dict, codes: Sequence[str]) -> Dict[str, str]:
+    """Validate model output against combined_translation_schema; raises ValueError when a language is missing"""
+    if not isinstance(data, dict):
+        raise ValueError("combined translation must be a JSON object")
+    missing = [code for code in codes if not isinstance(data.get(code), str) or not data[code].strip()]
+    if missing:
+        raise ValueError(f"combined translation is missing {', '.join(missing)}")
+    return {code: data[code].strip() for code in codes}
+
+
+def translate_llm_combined(client, text: str, languages: Sequence[Language]) -> Dict[str, str]:
+    """One structured-output call that returns text translated into every language, keyed by code"""
+    codes = [language.code for language in languages]
+    response = client.chat.completions.create(
+        model="gpt-4o-mini",
+        messages=[{
+            "role": "user",
+            "content": multi_translation_prompt(text, {language.code: language.name for language in languages}),
+        }],
+        temperature=0.3,
+        response_format={
+            "type": "json_schema",
+            "json_schema": {"name": "translations", "strict": True, "schema": combined_translation_schema(codes)},
+        },
+    )
+    return parse_combined_translation(json.loads(response.choices[0].message.content), codes)
+
+
+def _pick(combined: Future, code: str) -> Future:
+    """Future for one language of a combined translation"""
+    future: Future = Future()
+
+    def done(source: Future) -> None:
+        try:
+            future.set_result(source.result()[code])
+        except Exception as e:
+            future.set_exception(e)
+
+    combined.add_done_callback(done)
+    return future
+
+
+# --- Fan-out ---
+
+class MultilingualTranslator:
+    """Translates one text into any number of registered languages concurrently.
+
+    Each segmentation rule runs once per text however many languages use it, and every
+    target is scheduled on its own thread. Google targets go through translate_segments
+    (translation memory first, then pooled batches); LLM targets get one completion and
+    fall back to their Google segments when it fails. Wall-clock time is the slowest
+    language rather than the sum. With llm_mode "combined", two or more LLM targets share
+    one structured-output call instead. Threads are per call, so sessions never queue
+    behind each other here; the backends' own limits and the LLM rate limiter bound the load.
+    """
+
+    def __init__(self, client=None, backends: Optional[BackendPool] = None,
+                 memory: Optional[TranslationMemory] = None, llm_mode: str = LLM_TRANSLATION):
+        self.client = client
+        self.backends = backends or BackendPool()
+        self.memory = memory
+        self.llm_mode = llm_mode
+
+    def _llm(self, text: str, language: Language) -> str:
+        response = self.client.chat.completions.create(
+            model="gpt-4o-mini",
+            messages=[{"role": "user", "content": translation_prompt(text, language.name)}],
+            temperature=0.3
+        )
+        return response.choices[0].message.content
+
+    def _translate(self, text: str, language: Language, segmented: Optional[Segmented] = None) -> Translation:
+        if language.backend == LLM and self.client is not None:
+            try:
+                return Translation(self._llm(text, language))
+            except Exception as e:
+                logger.error(f"Error translating to {language.name}, falling back to Google: {str(e)}")
+        try:
+            segments, join = segmented or segment_text(text, language.segmentation)
+            result = translate_segments(
+                segments, target=language.code, translator=self.backends.get(language.code),
+                memory=self.memory, namespace=language.namespace,
+            )
+            return Translation(join(result.segments), result.complete)
+        except Exception as e:
+            logger.error(f"Error translating to {language.name}: {str(e)}")
+            return Translation(f"Translation error: {str(e)}", False)
+
+    def _translate_combined(self, text: str, languages: List[Language],
+                            segmented: Dict[str, Segmented]) -> Dict[str, Translation]:
+        try:
+            translated = translate_llm_combined(self.client, text, languages)
+            return {code: Translation(result) for code, result in translated.items()}
+        except Exception as e:
+            logger.error(f"Combined translation failed, translating each language separately: {str(e)}")
+        with ThreadPoolExecutor(max_workers=len(languages)) as pool:
+            results = pool.map(lambda language: self._translate(text, language, segmented[language.segmentation]), languages)
+            return {language.code: result for language, result in zip(languages, results)}
+
+    def translate(self, text: str, language: Language) -> Translation:
+        return self._translate(text, language)
+
+    def submit_many(self, text: str, languages: Sequence[Union[str, Language]]) -> Dict[str, Future]:
+        """Start every translation of text at once; futures of Translation are keyed by language code"""
+        languages = resolve_languages(languages)
+        segmented = {rule: segment_text(text, rule) for rule in {language.segmentation for language in languages}}
+        futures: Dict[str, Future] = {}
+        llm = [language for language in languages if language.backend == LLM and self.client is not None]
+        pool = ThreadPoolExecutor(max_workers=max(len(languages), 1), thread_name_prefix="languages")
+        try:
+            if self.llm_mode == "combined" and len(llm) > 1:
+                combined = pool.submit(self._translate_combined, text, llm, segmented)
+                futures.update({language.code: _pick(combined, language.code) for language in llm})
+            for language in languages:
+                if language.code not in futures:
+                    futures[language.code] = pool.submit(
+                        self._translate, text, language, segmented[language.segmentation]
+                    )
+        finally:
+            # Threads exit once their translations finish; callers wait on the futures
+            pool.shutdown(wait=False)
+        return {language.code: futures[language.code] for language in languages}
+
+    def translate_many(self, text: str, languages: Sequence[Union[str, Language]]) -> Dict[str, Translation]:
+        return {code: future.result() for code, future in self.submit_many(text, languages).items()}
@@ -0,0 +1,239 @@
+import hashlib
+import json
+import logging
+import time
+from types import SimpleNamespace
+from typing import Any, AsyncIterator, Dict, Iterator, Optional
+
+from openai.types.chat import ChatCompletion, ChatCompletionChunk
+
+from caching import TieredCache
+from rate_limit import RateLimiter
+from resilience import AsyncResilientChatCompletions, ResilientChatCompletions, queue_wait
+from tokenizer import count_tokens
+
+logger = logging.getLogger(__name__)
+
+
+def response_cache_key(request: Dict[str, Any]) -> str:
+    """Hash of the request parameters that determine a completion (model, messages, temperature, ...)"""
+    canonical = json.dumps(request, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _completion_dict(model: str, content: str, finish_reason: str = "stop") -> Dict[str, Any]:
+    return {
+        "id": "cached",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{
+            "index": 0,
+            "finish_reason": finish_reason,
+            "message": {"role": "assistant", "content": content},
+        }],
+    }
+
+
+def _replay_stream(cached: Dict[str, Any]) -> Iterator[ChatCompletionChunk]:
+    """Serve a cached completion to a streaming caller as a single chunk"""
+    choice = cached["choices"][0]
+    yield ChatCompletionChunk.model_validate({
+        "id": cached.get("id", "cached"),
+        "object": "chat.completion.chunk",
+        "created": cached.get("created", int(time.time())),
+        "model": cached.get("model", ""),
+        "choices": [{
+            "index": 0,
+            "delta": {"role": "assistant", "content": choice["message"]["content"]},
+            "finish_reason": choice.get("finish_reason") or "stop",
+        }],
+    })
+
+
+# Request parameters that change how a completion is delivered, not what it says
+_STREAM_PARAMS = ("stream", "stream_options")
+
+
+class CachedChatCompletions:
+    """Drop-in for `client.chat.completions` that memoizes responses, streamed or not"""
+
+    def __init__(self, completions, cache: TieredCache):
+        self._completions = completions
+        self.cache = cache
+
+    def create(self, **kwargs) -> Any:
+        stream = kwargs.get("stream", False)
+        # Streaming and non-streaming requests share entries: the completion text is the same.
+        # stream_options still goes upstream so usage reaches the rate limiter.
+        key = response_cache_key({name: value for name, value in kwargs.items() if name not in _STREAM_PARAMS})
+        cached = self.cache.get(key)
+        if cached is not None:
+            return _replay_stream(cached) if stream else ChatCompletion.model_validate(cached)
+
+        if stream:
+            return self._record_stream(key, kwargs)
+
+        response = self._completions.create(**kwargs)
+        self._store(key, response.model_dump(mode="json"))
+        return response
+
+    def _record_stream(self, key: str, kwargs: Dict[str, Any]) -> Iterator[ChatCompletionChunk]:
+        """Pass chunks through as they arrive and cache the assembled text once the stream completes"""
+        parts = []
+        finish_reason = None
+        for chunk in self._completions.create(**kwargs):
+            if chunk.choices:
+                parts.append(chunk.choices[0].delta.content or "")
+                finish_reason = chunk.choices[0].finish_reason or finish_reason
+            yield chunk
+        if finish_reason == "stop":
+            self._store(key, _completion_dict(kwargs.get("model", ""), "".join(parts), finish_reason))
+
+    def _store(self, key: str, value: Dict[str, Any]) -> None:
+        try:
+            self.cache.set(key, value)
+        except Exception as e:
+            logger.warning(f"Could not cache LLM response: {str(e)}")
+
+
+class AsyncCachedChatCompletions:
+    """Async counterpart of CachedChatCompletions for non-streaming requests"""
+
+    def __init__(self, completions, cache: TieredCache):
+        self._completions = completions
+        self.cache = cache
+
+    async def create(self, **kwargs) -> Any:
+        if kwargs.get("stream"):
+            return await self._completions.create(**kwargs)
+
+        key = response_cache_key(kwargs)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return ChatCompletion.model_validate(cached)
+
+        response = await self._completions.create(**kwargs)
+        try:
+            self.cache.set(key, response.model_dump(mode="json"))
+        except Exception as e:
+            logger.warning(f"Could not cache LLM response: {str(e)}")
+        return response
+
+
+# Completion tokens are unknown before the call; reserve this much unless max_tokens is set
+DEFAULT_COMPLETION_TOKENS = 800
+
+
+def estimate_request_tokens(request: Dict[str, Any]) -> int:
+    prompt_tokens = sum(count_tokens(str(message.get("content") or "")) for message in request.get("messages", []))
+    return prompt_tokens + (request.get("max_tokens") or DEFAULT_COMPLETION_TOKENS)
+
+
+def _usage_tokens(response) -> Optional[int]:
+    usage = getattr(response, "usage", None)
+    return getattr(usage, "total_tokens", None) if usage is not None else None
+
+
+def _with_usage(kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    """Ask a streamed request to end with a usage chunk (one with no choices)"""
+    if not kwargs.get("stream"):
+        return kwargs
+    return {**kwargs, "stream_options": {**(kwargs.get("stream_options") or {}), "include_usage": True}}
+
+
+class RateLimitedChatCompletions:
+    """Queues each request on the shared RateLimiter before it reaches the API.
+
+    The reservation is corrected with the usage the API reports: from the response, or for
+    streams from their final chunk.
+    """
+
+    def __init__(self, completions, limiter: RateLimiter):
+        self._completions = completions
+        self.limiter = limiter
+
+    def _metered(self, estimated: int, stream) -> Iterator[ChatCompletionChunk]:
+        usage = None
+        try:
+            for chunk in stream:
+                usage = _usage_tokens(chunk) or usage
+                yield chunk
+        finally:
+            self.limiter.record_usage(estimated, usage)
+
+    def create(self, **kwargs) -> Any:
+        estimated = estimate_request_tokens(kwargs)
+        queue_wait.set(self.limiter.acquire(estimated))
+        response = self._completions.create(**_with_usage(kwargs))
+        if kwargs.get("stream"):
+            return self._metered(estimated, response)
+        self.limiter.record_usage(estimated, _usage_tokens(response))
+        return response
+
+
+class AsyncRateLimitedChatCompletions(RateLimitedChatCompletions):
+    async def _metered_async(self, estimated: int, stream) -> AsyncIterator[ChatCompletionChunk]:
+        usage = None
+        try:
+            async for chunk in stream:
+                usage = _usage_tokens(chunk) or usage
+                yield chunk
+        finally:
+            self.limiter.record_usage(estimated, usage)
+
+    async def create(self, **kwargs) -> Any:
+        estimated = estimate_request_tokens(kwargs)
+        queue_wait.set(await self.limiter.acquire_async(estimated))
+        response = await self._completions.create(**_with_usage(kwargs))
+        if kwargs.get("stream"):
+            return self._metered_async(estimated, response)
+        self.limiter.record_usage(estimated, _usage_tokens(response))
+        return response
+
+
+class _WrappedClient:
+    """Delegates everything to the inner client except `chat.completions`"""
+    completions_class: type = None
+
+    def __init__(self, client, *args, **kwargs):
+        self._client = client
+        self.chat = SimpleNamespace(completions=self.completions_class(client.chat.completions, *args, **kwargs))
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._client, name)
+
+
+class CachedOpenAIClient(_WrappedClient):
+    """Wraps an OpenAI client so chat completions go through the response cache"""
+    completions_class = CachedChatCompletions
+
+    @property
+    def cache(self) -> TieredCache:
+        return self.chat.completions.cache
+
+
+class AsyncCachedOpenAIClient(CachedOpenAIClient):
+    """Wraps an AsyncOpenAI client so chat completions go through the shared response cache"""
+    completions_class = AsyncCachedChatCompletions
+
+
+class RateLimitedOpenAIClient(_WrappedClient):
+    """Wraps an OpenAI client so every API call is admitted by the RPM/TPM limiter"""
+    completions_class = RateLimitedChatCompletions
+
+
+class AsyncRateLimitedOpenAIClient(_WrappedClient):
+    completions_class = AsyncRateLimitedChatCompletions
+
+
+class ResilientOpenAIClient(_WrappedClient):
+    """Wraps an OpenAI client with classified retries, a circuit breaker and optional hedging"""
+    completions_class = ResilientChatCompletions
+
+    def resilience_stats(self) -> Dict[str, Any]:
+        return self.chat.completions.stats()
+
+
+class AsyncResilientOpenAIClient(_WrappedClient):
+    completions_class = AsyncResilientChatCompletions
@@ -0,0 +1,308 @@
+import logging
+import multiprocessing
+import os
+import re
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+import fitz  # PyMuPDF
+
+from caching import LRUCache, content_digest
+from tokenizer import count_tokens
+
+logger = logging.getLogger(__name__)
+
+
+# Pages after the sample go to the worker pool only when extracting them serially would take at
+# least this long; below it, shipping pages to and from workers costs more than it saves
+PARALLEL_MIN_SECONDS = float(os.getenv("MYGOV_PARALLEL_EXTRACTION_SECONDS", "1.0"))
+# Pages extracted serially first to measure this document's per-page cost
+SAMPLE_PAGES = 8
+
+# Sentence ends (including the Devanagari danda) and blank lines, captured so splits keep them
+_SENTENCE_BOUNDARY = re.compile(r'((?<=[.!?\u0964\u0965])\s+|\n\s*\n)')
+_PAGE_MARKER = re.compile(r'\n--- Page (\d+) ---\n')
+
+# Never fork: the Streamlit server is multi-threaded, and a child forked while another thread
+# holds a lock (logging, the rate limiter, SQLite) can deadlock
+_MP_CONTEXT = multiprocessing.get_context(
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+
+
+def usable_cpus() -> int:
+    """CPUs this process may run on (the affinity mask, not the host's CPU count)"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+# Size of the process-wide extraction pool; 1 disables parallel extraction
+EXTRACTION_WORKERS = int(os.getenv("MYGOV_EXTRACTION_WORKERS", "0")) or usable_cpus()
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+@dataclass
+class PageRecord:
+    """One extracted page; page_number is 1-based like the page markers"""
+    page_number: int
+    text: str
+    char_count: int
+    token_estimate: int
+
+
+def _page_text(pdf_document, page_num: int) -> str:
+    return pdf_document[page_num].get_text(sort=True)
+
+
+def _extract_page_range(path: str, start: int, stop: int) -> List[Tuple[int, str]]:
+    """Worker task: extract pages [start, stop) of the PDF at path"""
+    pdf_document = fitz.open(path)
+    try:
+        return [(page_num, _page_text(pdf_document, page_num)) for page_num in range(start, stop)]
+    finally:
+        pdf_document.close()
+
+
+def _split_page_range(start: int, stop: int, parts: int) -> List[Tuple[int, int]]:
+    size, extra = divmod(stop - start, parts)
+    ranges = []
+    for i in range(parts):
+        end = start + size + (1 if i < extra else 0)
+        if end > start:
+            ranges.append((start, end))
+        start = end
+    return ranges
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    """The extraction pool, started on first use and shared by every document after that"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=EXTRACTION_WORKERS, mp_context=_MP_CONTEXT)
+        return _pool
+
+
+def _discard_pool(pool: ProcessPoolExecutor) -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def count_pages(pdf_bytes: bytes) -> int:
+    pdf_document = fitz.open(stream=pdf_bytes, filetype="pdf")
+    try:
+        return len(pdf_document)
+    finally:
+        pdf_document.close()
+
+
+def _iter_pages_serial(pdf_bytes: bytes, start: int = 0) -> Iterator[Tuple[int, str]]:
+    pdf_document = fitz.open(stream=pdf_bytes, filetype="pdf")
+    try:
+        for page_num in range(start, len(pdf_document)):
+            yield page_num, _page_text(pdf_document, page_num)
+    finally:
+        pdf_document.close()
+
+
+def _iter_pages_parallel(pdf_bytes: bytes, start: int, stop: int) -> Iterator[Tuple[int, str]]:
+    # A few ranges per worker keeps the pool busy when some pages are much heavier than others
+    ranges = _split_page_range(start, stop, EXTRACTION_WORKERS * 4)
+    pool = _get_pool()
+    # Workers open the document from a file, so the bytes aren't pickled into every task
+    fd, path = tempfile.mkstemp(suffix=".pdf")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(pdf_bytes)
+        futures = [pool.submit(_extract_page_range, path, range_start, range_stop) for range_start, range_stop in ranges]
+        try:
+            for future in futures:
+                yield from future.result()
+        except BrokenProcessPool:
+            _discard_pool(pool)
+            raise
+        finally:
+            # Consumers may stop early; don't leave queued ranges running, and let running
+            # ones finish before their file goes away
+            for future in futures:
+                future.cancel()
+            wait(futures)
+    finally:
+        os.remove(path)
+
+
+def _iter_pages_auto(pdf_bytes: bytes) -> Iterator[Tuple[int, str]]:
+    """Serial for the first SAMPLE_PAGES pages, then parallel when the rest is worth a pool"""
+    pdf_document = fitz.open(stream=pdf_bytes, filetype="pdf")
+    try:
+        page_count = len(pdf_document)
+        elapsed = 0.0
+        for page_num in range(page_count):
+            if page_num == SAMPLE_PAGES and EXTRACTION_WORKERS > 1:
+                if elapsed / page_num * (page_count - page_num) >= PARALLEL_MIN_SECONDS:
+                    break
+            started = time.perf_counter()
+            page_text = _page_text(pdf_document, page_num)
+            elapsed += time.perf_counter() - started
+            yield page_num, page_text
+        else:
+            return
+    finally:
+        pdf_document.close()
+    yield from _iter_pages_parallel(pdf_bytes, SAMPLE_PAGES, page_count)
+
+
+def _to_record(page_num: int, page_text: str) -> PageRecord:
+    # Counted once here; the count is cached with the page in ExtractionCache
+    return PageRecord(page_num + 1, page_text, len(page_text), count_tokens(page_text))
+
+
+def iter_pdf_pages(pdf_bytes: bytes, mode: str = "auto") -> Iterator[PageRecord]:
+    """Yield non-blank pages in order.
+
+    "auto" extracts serially and moves the remaining pages to the shared process pool once a
+    sample shows they would take over PARALLEL_MIN_SECONDS, so small documents and single-CPU
+    hosts never pay for workers; "serial" and "parallel" force either path.
+    """
+    if mode == "parallel":
+        pages = _iter_pages_parallel(pdf_bytes, 0, count_pages(pdf_bytes))
+    elif mode == "auto":
+        pages = _iter_pages_auto(pdf_bytes)
+    else:
+        pages = _iter_pages_serial(pdf_bytes)
+
+    next_page = 0
+    try:
+        for page_num, page_text in pages:
+            next_page = page_num + 1
+            if page_text.strip():
+                yield _to_record(page_num, page_text)
+    except (OSError, RuntimeError) as e:
+        if mode == "serial":
+            raise
+        logger.warning(f"Parallel extraction failed at page {next_page + 1}, continuing serially: {str(e)}")
+        for page_num, page_text in _iter_pages_serial(pdf_bytes, start=next_page):
+            if page_text.strip():
+                yield _to_record(page_num, page_text)
+    finally:
+        pages.close()
+
+
+def _page_marker(page_number: int) -> str:
+    return f"\n--- Page {page_number} ---\n"
+
+
+def format_pages(pages: Iterable[PageRecord]) -> str:
+    """Render page records with the `--- Page N ---` markers used in prompts and previews"""
+    return "".join(_page_marker(page.page_number) + page.text for page in pages)
+
+
+def parse_pages(text: str) -> List[PageRecord]:
+    """Recover page records from format_pages() output; text without markers becomes one page"""
+    parts = _PAGE_MARKER.split(text)
+    if len(parts) == 1:
+        return [_to_record(0, text)] if text.strip() else []
+    return [_to_record(int(number) - 1, body) for number, body in zip(parts[1::2], parts[2::2])]
+
+
+def formatted_token_count(pages: Iterable[PageRecord]) -> int:
+    """Tokens in format_pages(pages), from the cached per-page counts"""
+    return sum(count_tokens(_page_marker(page.page_number)) + page.token_estimate for page in pages)
+
+
+def _split_sentences(text: str) -> List[str]:
+    pieces = _SENTENCE_BOUNDARY.split(text)
+    return ["".join(pieces[i:i + 2]) for i in range(0, len(pieces), 2)]
+
+
+def fit_pages_to_budget(pages: Iterable[PageRecord], max_tokens: int) -> str:
+    """Format pages in order until max_tokens is reached, cutting the last page on a sentence boundary"""
+    parts = []
+    used = 0
+    for page in pages:
+        marker = _page_marker(page.page_number)
+        marker_tokens = count_tokens(marker)
+        if used + marker_tokens + page.token_estimate <= max_tokens:
+            parts.append(marker + page.text)
+            used += marker_tokens + page.token_estimate
+            continue
+
+        remaining = max_tokens - used - marker_tokens
+        taken = []
+        for sentence in _split_sentences(page.text):
+            sentence_tokens = count_tokens(sentence)
+            if sentence_tokens > remaining:
+                break
+            taken.append(sentence)
+            remaining -= sentence_tokens
+        if not taken and not parts and remaining > 0:
+            # A first page with no usable boundary is cut by length at its own characters-per-token rate
+            taken.append(page.text[:len(page.text) * remaining // max(page.token_estimate, 1)])
+        if taken:
+            parts.append(marker + "".join(taken))
+        break
+    return "".join(parts)
+
+
+def split_into_chunks(text: str, max_tokens: int = 3000) -> List[str]:
+    """Split text into chunks of at most ~max_tokens, keeping paragraphs and pages together where possible"""
+    chunks = []
+    current: List[str] = []
+    current_tokens = 0
+
+    for paragraph in re.split(r'\n\s*\n|(?=\n--- Page \d+ ---\n)', text):
+        if not paragraph.strip():
+            continue
+        paragraph_tokens = count_tokens(paragraph)
+        if paragraph_tokens <= max_tokens:
+            pieces = [paragraph]
+        else:
+            # Oversized paragraphs (e.g. whole pages without blank lines) are hard-split by length,
+            # at this paragraph's own characters-per-token rate so Indic text isn't oversized
+            max_chars = max(1, len(paragraph) * max_tokens // paragraph_tokens)
+            pieces = [paragraph[i:i + max_chars] for i in range(0, len(paragraph), max_chars)]
+        for piece in pieces:
+            piece_tokens = paragraph_tokens if len(pieces) == 1 else count_tokens(piece)
+            if current and current_tokens + piece_tokens > max_tokens:
+                chunks.append("\n\n".join(current))
+                current, current_tokens = [], 0
+            current.append(piece)
+            current_tokens += piece_tokens
+
+    if current:
+        chunks.append("\n\n".join(current))
+    return chunks
+
+
+class ExtractionCache:
+    """Extracted pages keyed by document digest, in memory; the scheme store persists them"""
+
+    def __init__(self, max_entries: int = 32):
+        self.memory = LRUCache(max_entries=max_entries)
+
+    def get(self, digest: str) -> Optional[List[PageRecord]]:
+        return self.memory.get(digest)
+
+    def set(self, digest: str, pages: List[PageRecord]) -> None:
+        self.memory.set(digest, pages)
+
+    def get_or_extract(self, pdf_bytes: bytes) -> List[PageRecord]:
+        """Return cached pages for these bytes, extracting only on a miss"""
+        digest = content_digest(pdf_bytes)
+        pages = self.get(digest)
+        if pages is None:
+            pages = list(iter_pdf_pages(pdf_bytes))
+            self.set(digest, pages)
+        return pages
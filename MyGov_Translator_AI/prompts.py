@@ -0,0 +1,138 @@
+from typing import Dict, List
+
+# Document tokens a single-pass summary prompt may carry; longer documents are cut down to their most
+# relevant passages by default (long_document="select"), or go through map-reduce or truncation
+SUMMARY_INPUT_TOKENS = 6000
+
+# Shared output structure for single-pass and map-reduce summaries
+SCHEME_SUMMARY_FORMAT = """
+        **SCHEME NAME:** [Name of the scheme]
+
+        **PURPOSE:** [What this scheme aims to achieve]
+
+        **KEY BENEFITS:**
+        • [Benefit 1]
+        • [Benefit 2]
+        • [Benefit 3]
+
+        **ELIGIBILITY CRITERIA:**
+        • [Criterion 1]
+        • [Criterion 2]
+        • [Criterion 3]
+
+        **REQUIRED DOCUMENTS:**
+        • [Document 1]
+        • [Document 2]
+        • [Document 3]
+
+        **APPLICATION PROCESS:**
+        1. [Step 1]
+        2. [Step 2]
+        3. [Step 3]
+
+        **IMPORTANT DETAILS:**
+        • Application deadline: [if mentioned]
+        • Contact information: [if mentioned]
+        • Subsidy/benefit amount: [if mentioned]
+"""
+
+
+def scheme_summary_prompt(text: str) -> str:
+    return f"""
+        You are an expert government policy analyst. Analyze this government scheme document and provide a comprehensive summary in the following format:
+{SCHEME_SUMMARY_FORMAT}
+        Document content:
+        {text}
+        """
+
+
+def chunk_summary_prompt(chunk: str, part: int, total: int) -> str:
+    return f"""
+        You are an expert government policy analyst. Below is part {part} of {total} of a government scheme document.
+        Extract every detail from THIS PART that belongs in the summary format below. Write "Not mentioned in this part" for sections with no information here. Do not guess.
+{SCHEME_SUMMARY_FORMAT}
+        Document content (part {part} of {total}):
+        {chunk}
+        """
+
+
+def reduce_summary_prompt(partials: List[str]) -> str:
+    """Merge prompt; partials are already labelled "--- Partial summary i of n ---" """
+    return f"""
+        You are an expert government policy analyst. The partial summaries below each cover one part of the same government scheme document.
+        Merge them into ONE comprehensive summary in the following format. Combine and de-duplicate items, keep all specific amounts, dates and criteria, and ignore "Not mentioned" entries when another part has the information.
+{SCHEME_SUMMARY_FORMAT}
+        Partial summaries:
+        {chr(10).join(partials)}
+        """
+
+
+def label_partial(summary: str, part: int, total: int) -> str:
+    return f"--- Partial summary {part} of {total} ---\n{summary}"
+
+
+def eligibility_prompt(summary: str, user_profile: Dict) -> str:
+    profile_text = f"""
+        Age: {user_profile.get('age', 'Not specified')}
+        Gender: {user_profile.get('gender', 'Not specified')}
+        Income: {user_profile.get('income', 'Not specified')}
+        Category: {user_profile.get('category', 'Not specified')}
+        State: {user_profile.get('state', 'Not specified')}
+        Occupation: {user_profile.get('occupation', 'Not specified')}
+        Education: {user_profile.get('education', 'Not specified')}
+        """
+
+    return f"""
+        Based on the government scheme details and user profile below, determine eligibility and provide guidance.
+
+        SCHEME DETAILS:
+        {summary}
+
+        USER PROFILE:
+        {profile_text}
+
+        Provide a response in this format:
+
+        **ELIGIBILITY STATUS:** [ELIGIBLE/NOT ELIGIBLE/PARTIALLY ELIGIBLE]
+
+        **EXPLANATION:**
+        [Detailed explanation of why they are or aren't eligible]
+
+        **IF NOT ELIGIBLE - STEPS TO BECOME ELIGIBLE:**
+        1. [Step 1 if applicable]
+        2. [Step 2 if applicable]
+        3. [Step 3 if applicable]
+
+        **NEXT STEPS:**
+        [What the user should do next to apply or become eligible]
+
+        **REQUIRED DOCUMENTATION:**
+        [List documents they need to gather based on their profile]
+        """
+
+
+def translation_prompt(text: str, language: str = "Hindi") -> str:
+    return f"""
+        Translate the following government scheme information to very simple {language} that a common person, farmer, or villager can easily understand.
+        Use simple words and avoid complex technical terms. Make it conversational and easy to understand.
+
+        Text to translate:
+        {text}
+        """
+
+
+def multi_translation_prompt(text: str, languages: Dict[str, str]) -> str:
+    """One prompt for several target languages, keyed by language code"""
+    targets = "\n".join(f"        - {code}: {name}" for code, name in languages.items())
+    return f"""
+        Translate the following government scheme information to very simple language that a common person, farmer, or villager can easily understand, once for each language below.
+        Use simple words and avoid complex technical terms. Make it conversational and easy to understand.
+        Keep the markdown layout and every amount, date and number exactly as in the original.
+        Return a JSON object with one key per language code, holding the full translation into that language.
+
+        Languages:
+{targets}
+
+        Text to translate:
+        {text}
+        """
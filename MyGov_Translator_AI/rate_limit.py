@@ -0,0 +1,119 @@
+import asyncio
+import logging
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+# Defaults sit a little under the usual gpt-4o-mini tier limits; override per deployment
+DEFAULT_RPM = int(os.getenv("MYGOV_OPENAI_RPM", "450"))
+DEFAULT_TPM = int(os.getenv("MYGOV_OPENAI_TPM", "180000"))
+
+
+class RateLimiter:
+    """Process-wide token buckets for requests/minute and tokens/minute.
+
+    Callers reserve capacity up front and the buckets may go into debt; each caller then
+    sleeps until its share has refilled. That queues bursts in arrival order instead of
+    failing them, and lets actual usage correct the estimate afterwards.
+    """
+
+    def __init__(self, rpm: int = DEFAULT_RPM, tpm: int = DEFAULT_TPM):
+        self.rpm = rpm
+        self.tpm = tpm
+        self._request_tokens = float(rpm)
+        self._token_tokens = float(tpm)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.waited_requests = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.waiting = 0
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        self._updated = now
+        self._request_tokens = min(self.rpm, self._request_tokens + elapsed * self.rpm / 60.0)
+        self._token_tokens = min(self.tpm, self._token_tokens + elapsed * self.tpm / 60.0)
+
+    def _reserve(self, estimated_tokens: int) -> float:
+        """Take capacity for one request and return how long the caller must wait for it"""
+        # A single request larger than the bucket could never be admitted otherwise
+        cost = min(max(estimated_tokens, 1), self.tpm)
+        with self._lock:
+            self._refill(time.monotonic())
+            self._request_tokens -= 1
+            self._token_tokens -= cost
+            wait = max(
+                0.0,
+                -self._request_tokens * 60.0 / self.rpm,
+                -self._token_tokens * 60.0 / self.tpm,
+            )
+            self.requests += 1
+            if wait > 0:
+                self.waited_requests += 1
+                self.total_wait += wait
+                self.max_wait = max(self.max_wait, wait)
+        if wait > 1.0:
+            logger.info(f"Rate limiter queueing request for {wait:.1f}s")
+        return wait
+
+    def acquire(self, estimated_tokens: int) -> float:
+        """Block until the request fits under RPM and TPM; returns the time spent queued"""
+        wait = self._reserve(estimated_tokens)
+        if wait > 0:
+            with self._lock:
+                self.waiting += 1
+            try:
+                time.sleep(wait)
+            finally:
+                with self._lock:
+                    self.waiting -= 1
+        return wait
+
+    async def acquire_async(self, estimated_tokens: int) -> float:
+        wait = self._reserve(estimated_tokens)
+        if wait > 0:
+            with self._lock:
+                self.waiting += 1
+            try:
+                await asyncio.sleep(wait)
+            finally:
+                with self._lock:
+                    self.waiting -= 1
+        return wait
+
+    def record_usage(self, estimated_tokens: int, actual_tokens: Optional[int]) -> None:
+        """Correct the token bucket once the response reports real usage"""
+        if actual_tokens is None:
+            return
+        with self._lock:
+            self._token_tokens += min(max(estimated_tokens, 1), self.tpm) - actual_tokens
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "queued_requests": self.waited_requests,
+                "waiting_now": self.waiting,
+                "total_wait_s": round(self.total_wait, 3),
+                "avg_wait_s": round(self.total_wait / self.requests, 3) if self.requests else 0.0,
+                "max_wait_s": round(self.max_wait, 3),
+            }
+
+
+_default_limiter: Optional[RateLimiter] = None
+_default_lock = threading.Lock()
+
+
+def get_default_limiter() -> RateLimiter:
+    """The limiter shared by every client in this process"""
+    global _default_limiter
+    with _default_lock:
+        if _default_limiter is None:
+            _default_limiter = RateLimiter()
+        return _default_limiter
@@ -0,0 +1,141 @@
+import math
+import re
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from typing import Dict, Iterable, List
+
+from pdf_extraction import PageRecord, split_into_chunks
+from tokenizer import count_tokens
+
+
+# Word characters plus Devanagari and Telugu vowel signs, which str.isalnum() rejects (dandas excluded)
+_TERM = re.compile(r"[\w\u0900-\u0963\u0966-\u097F\u0C00-\u0C7F]+")
+
+# One query per summary section that needs evidence from the body of the document
+SECTION_QUERIES: Dict[str, str] = {
+    "benefits": "benefit benefits assistance financial subsidy grant amount incentive rs rupees lakh per annum "
+                "month installment loan pension scholarship लाभ सहायता राशि अनुदान",
+    "eligibility": "eligible eligibility criteria applicant age years income family category resident domicile "
+                   "beneficiary beneficiaries must should not पात्रता पात्र आयु आय",
+    "documents": "documents document required certificate proof copy aadhaar card bank account passbook "
+                 "photograph income caste domicile दस्तावेज दस्तावेज़ प्रमाण पत्र",
+    "application": "apply application process procedure submit online portal form register registration "
+                   "office verification website आवेदन प्रक्रिया पंजीकरण",
+    "deadlines": "deadline last date closing within days period validity till before contact helpline email "
+                 "phone अंतिम तिथि तारीख संपर्क",
+}
+
+
+def tokenize_terms(text: str) -> List[str]:
+    return [term.lower() for term in _TERM.findall(text)]
+
+
+@dataclass
+class Chunk:
+    """A retrievable slice of one page"""
+    page_number: int
+    text: str
+    tokens: int
+
+
+def chunk_pages(pages: Iterable[PageRecord], chunk_tokens: int = 300) -> List[Chunk]:
+    """Split each page into paragraph-aligned chunks of at most ~chunk_tokens, in document order"""
+    chunks = []
+    for page in pages:
+        if page.token_estimate <= chunk_tokens:
+            chunks.append(Chunk(page.page_number, page.text, page.token_estimate))
+            continue
+        for text in split_into_chunks(page.text, max_tokens=chunk_tokens):
+            chunks.append(Chunk(page.page_number, text, count_tokens(text)))
+    return chunks
+
+
+class BM25Index:
+    """Okapi BM25 over a fixed list of texts, built in one pass with sparse postings"""
+
+    def __init__(self, texts: Iterable[str], k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, List[tuple]] = defaultdict(list)
+        self._lengths: List[int] = []
+        for doc_id, text in enumerate(texts):
+            terms = tokenize_terms(text)
+            self._lengths.append(len(terms))
+            for term, frequency in Counter(terms).items():
+                self._postings[term].append((doc_id, frequency))
+        self._avg_length = sum(self._lengths) / len(self._lengths) if self._lengths else 0.0
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    def _idf(self, term: str) -> float:
+        n = len(self._postings.get(term, ()))
+        return math.log(1 + (len(self._lengths) - n + 0.5) / (n + 0.5))
+
+    def scores(self, query: str) -> List[float]:
+        """BM25 score of every text for query; texts sharing no term score 0"""
+        scores = [0.0] * len(self._lengths)
+        for term in set(tokenize_terms(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = self._idf(term)
+            for doc_id, frequency in postings:
+                norm = self.k1 * (1 - self.b + self.b * self._lengths[doc_id] / self._avg_length)
+                scores[doc_id] += idf * frequency * (self.k1 + 1) / (frequency + norm)
+        return scores
+
+    def rank(self, query: str) -> List[int]:
+        """Ids of texts matching query, best first"""
+        scores = self.scores(query)
+        return sorted((i for i, score in enumerate(scores) if score > 0), key=lambda i: -scores[i])
+
+
+def select_relevant_chunks(
+    chunks: List[Chunk], max_tokens: int, queries: Dict[str, str] = SECTION_QUERIES
+) -> List[Chunk]:
+    """Pick chunks round-robin from each section's ranking until max_tokens is spent, in document order.
+
+    The opening chunk is always kept since it usually carries the scheme name and purpose.
+    """
+    if not chunks:
+        return []
+    index = BM25Index(chunk.text for chunk in chunks)
+    rankings = [iter(index.rank(query)) for query in queries.values()]
+
+    selected = set()
+    used = 0
+    if chunks[0].tokens <= max_tokens:
+        selected.add(0)
+        used = chunks[0].tokens
+    while rankings:
+        for ranking in list(rankings):
+            # Each section takes its best remaining chunk that still fits
+            for i in ranking:
+                if i not in selected and used + chunks[i].tokens <= max_tokens:
+                    selected.add(i)
+                    used += chunks[i].tokens
+                    break
+            else:
+                rankings.remove(ranking)
+    return [chunks[i] for i in sorted(selected)]
+
+
+def format_chunks(chunks: Iterable[Chunk]) -> str:
+    """Render selected chunks under the usual `--- Page N ---` markers, one marker per page"""
+    parts = []
+    page_number = None
+    for chunk in chunks:
+        if chunk.page_number != page_number:
+            page_number = chunk.page_number
+            parts.append(f"\n--- Page {page_number} ---\n")
+        else:
+            parts.append("\n\n")
+        parts.append(chunk.text)
+    return "".join(parts)
+
+
+def relevant_excerpt(pages: List[PageRecord], max_tokens: int, chunk_tokens: int = 300) -> str:
+    """Best-matching passages for every summary section, packed into max_tokens"""
+    # Leave room for the page markers and joins added by format_chunks()
+    return format_chunks(select_relevant_chunks(chunk_pages(pages, chunk_tokens), int(max_tokens * 0.95)))
@@ -0,0 +1,290 @@
+import asyncio
+import logging
+import os
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+
+import openai
+
+logger = logging.getLogger(__name__)
+
+
+RATE_LIMIT, TIMEOUT, SERVER_ERROR = "rate_limit", "timeout", "server_error"
+
+# Seconds one OpenAI request may take before it is abandoned (and retried as a timeout)
+REQUEST_TIMEOUT = float(os.getenv("MYGOV_LLM_TIMEOUT", "60"))
+
+# Hedging duplicates slow requests and so spends extra tokens; opt in per deployment
+HEDGE_REQUESTS = os.getenv("MYGOV_HEDGE_REQUESTS", "").lower() in ("1", "true", "yes")
+
+# Seconds the current call spent queued in the rate limiter below this layer; set by
+# RateLimitedChatCompletions so latency (and the hedge threshold) only counts time at the API
+queue_wait: ContextVar[float] = ContextVar("queue_wait", default=0.0)
+
+
+def classify_error(error: BaseException) -> Optional[str]:
+    """Return the retry class of an OpenAI error, or None when retrying cannot help"""
+    if isinstance(error, openai.RateLimitError):
+        return RATE_LIMIT
+    if isinstance(error, (openai.APITimeoutError, openai.APIConnectionError)):
+        return TIMEOUT
+    if isinstance(error, openai.APIStatusError) and error.status_code >= 500:
+        return SERVER_ERROR
+    return None
+
+
+def _retry_after(error: BaseException) -> Optional[float]:
+    response = getattr(error, "response", None)
+    try:
+        return float(response.headers.get("retry-after")) if response is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised without calling the API while the circuit breaker is open"""
+
+
+class CircuitBreaker:
+    """Opens after consecutive retryable failures, then lets one probe through after reset_timeout"""
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probing = False
+        self._lock = threading.Lock()
+        self.trips = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            return "half-open" if time.monotonic() - self._opened_at >= self.reset_timeout else "open"
+
+    def before_call(self) -> None:
+        with self._lock:
+            if self._opened_at is None:
+                return
+            if time.monotonic() - self._opened_at < self.reset_timeout or self._probing:
+                raise CircuitOpenError("OpenAI is failing repeatedly; pausing calls briefly")
+            self._probing = True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._probing or self._failures >= self.failure_threshold:
+                if self._opened_at is None or self._probing:
+                    self.trips += 1
+                self._opened_at = time.monotonic()
+                self._probing = False
+
+
+class LatencyTracker:
+    """Rolling window of successful call latencies for the hedge threshold"""
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self._samples = deque(maxlen=window)
+        self.min_samples = min_samples
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, q: float) -> Optional[float]:
+        with self._lock:
+            if len(self._samples) < self.min_samples:
+                return None
+            ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter, honouring Retry-After on rate limits"""
+
+    def __init__(self, max_attempts: int = 4, base_delay: float = 0.5, max_delay: float = 20.0):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, attempt: int, error: BaseException) -> float:
+        backoff = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+        retry_after = _retry_after(error) if classify_error(error) == RATE_LIMIT else None
+        return max(backoff, retry_after or 0.0)
+
+
+class ResilientChatCompletions:
+    """Classified retries, circuit breaking and optional hedging around `chat.completions.create`"""
+
+    def __init__(
+        self,
+        completions,
+        policy: Optional[RetryPolicy] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        hedge: bool = False,
+        hedge_quantile: float = 0.95,
+        hedge_pool_size: int = 8,
+    ):
+        self._completions = completions
+        self.policy = policy or RetryPolicy()
+        self.breaker = breaker or CircuitBreaker()
+        self.latency = LatencyTracker()
+        self.hedge = hedge
+        self.hedge_quantile = hedge_quantile
+        self._hedge_pool = ThreadPoolExecutor(max_workers=hedge_pool_size, thread_name_prefix="llm-hedge") if hedge else None
+        # A hedge fired while requests queue in the rate limiter below would only join the
+        # queue, doubling load exactly when the bucket is in debt
+        self._limiter = getattr(completions, "limiter", None)
+        self.retries: Dict[str, int] = {RATE_LIMIT: 0, TIMEOUT: 0, SERVER_ERROR: 0}
+        self.hedges_fired = 0
+        self.hedges_won = 0
+
+    def _queue_busy(self) -> bool:
+        return self._limiter is not None and self._limiter.waiting > 0
+
+    def _timed_call(self, kwargs: Dict[str, Any]) -> Any:
+        token = queue_wait.set(0.0)
+        try:
+            start = time.monotonic()
+            response = self._completions.create(**kwargs)
+            if not kwargs.get("stream"):
+                self.latency.record(time.monotonic() - start - queue_wait.get())
+            return response
+        finally:
+            queue_wait.reset(token)
+
+    def _hedged_call(self, kwargs: Dict[str, Any]) -> Any:
+        threshold = self.latency.percentile(self.hedge_quantile)
+        if self._hedge_pool is None or kwargs.get("stream") or threshold is None:
+            return self._timed_call(kwargs)
+
+        primary = self._hedge_pool.submit(self._timed_call, kwargs)
+        done, _ = wait([primary], timeout=threshold)
+        if done or self._queue_busy():
+            return primary.result()
+
+        self.hedges_fired += 1
+        backup = self._hedge_pool.submit(self._timed_call, kwargs)
+        pending = {primary, backup}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is backup:
+                        self.hedges_won += 1
+                    return future.result()
+                error = future.exception()
+        raise error
+
+    def _after_error(self, error: Exception, attempt: int) -> float:
+        """Record the failure and return the backoff delay, or re-raise when not retryable"""
+        kind = classify_error(error)
+        if kind is None or kind == RATE_LIMIT:
+            # The API answered (a 400, or a 429 asking us to slow down), so it is healthy even
+            # though this request failed; throttling is handled by backoff, not by the breaker
+            self.breaker.record_success()
+            if kind is None:
+                raise error
+        else:
+            self.breaker.record_failure()
+        if attempt + 1 >= self.policy.max_attempts:
+            raise error
+        self.retries[kind] += 1
+        delay = self.policy.delay(attempt, error)
+        logger.warning(f"OpenAI {kind} on attempt {attempt + 1}, retrying in {delay:.1f}s: {str(error)}")
+        return delay
+
+    def create(self, **kwargs) -> Any:
+        for attempt in range(self.policy.max_attempts):
+            self.breaker.before_call()
+            try:
+                response = self._hedged_call(kwargs)
+            except Exception as e:
+                time.sleep(self._after_error(e, attempt))
+                continue
+            self.breaker.record_success()
+            return response
+
+    def stats(self) -> Dict[str, Any]:
+        p95 = self.latency.percentile(0.95)
+        return {
+            "circuit": self.breaker.state,
+            "circuit_trips": self.breaker.trips,
+            "retries": dict(self.retries),
+            "p95_latency_s": round(p95, 2) if p95 is not None else None,
+            "hedges_fired": self.hedges_fired,
+            "hedges_won": self.hedges_won,
+        }
+
+
+class AsyncResilientChatCompletions(ResilientChatCompletions):
+    def __init__(self, completions, policy: Optional[RetryPolicy] = None,
+                 breaker: Optional[CircuitBreaker] = None, hedge: bool = False, hedge_quantile: float = 0.95):
+        # Hedges here are tasks on the event loop, so skip the base class's thread pool
+        super().__init__(completions, policy, breaker, hedge=False, hedge_quantile=hedge_quantile)
+        self.hedge = hedge
+
+    async def _timed_call(self, kwargs: Dict[str, Any]) -> Any:
+        token = queue_wait.set(0.0)
+        try:
+            start = time.monotonic()
+            response = await self._completions.create(**kwargs)
+            if not kwargs.get("stream"):
+                self.latency.record(time.monotonic() - start - queue_wait.get())
+            return response
+        finally:
+            queue_wait.reset(token)
+
+    async def _hedged_call(self, kwargs: Dict[str, Any]) -> Any:
+        threshold = self.latency.percentile(self.hedge_quantile)
+        if not self.hedge or kwargs.get("stream") or threshold is None:
+            return await self._timed_call(kwargs)
+
+        primary = asyncio.ensure_future(self._timed_call(kwargs))
+        done, _ = await asyncio.wait({primary}, timeout=threshold)
+        if done or self._queue_busy():
+            return await primary
+
+        self.hedges_fired += 1
+        backup = asyncio.ensure_future(self._timed_call(kwargs))
+        pending = {primary, backup}
+        error = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is backup:
+                            self.hedges_won += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def create(self, **kwargs) -> Any:
+        for attempt in range(self.policy.max_attempts):
+            self.breaker.before_call()
+            try:
+                response = await self._hedged_call(kwargs)
+            except Exception as e:
+                await asyncio.sleep(self._after_error(e, attempt))
+                continue
+            self.breaker.record_success()
+            return response
@@ -0,0 +1,127 @@
+import json
+import os
+from dataclasses import dataclass, field, fields
+from typing import Dict, List
+
+
+# Structured summaries are the default; set MYGOV_STRUCTURED_SUMMARY=0 for the streamed markdown summary
+STRUCTURED_SUMMARY = os.getenv("MYGOV_STRUCTURED_SUMMARY", "1").lower() not in ("0", "false", "no")
+
+
+@dataclass
+class SchemeRecord:
+    """Typed scheme summary; list fields hold one short item each and may be empty"""
+    name: str
+    purpose: str
+    benefits: List[str] = field(default_factory=list)
+    eligibility_criteria: List[str] = field(default_factory=list)
+    required_documents: List[str] = field(default_factory=list)
+    application_steps: List[str] = field(default_factory=list)
+    deadlines: List[str] = field(default_factory=list)
+    amounts: List[str] = field(default_factory=list)
+    contact: str = ""
+
+
+_TEXT_FIELDS = ("name", "purpose", "contact")
+_LIST_FIELDS = tuple(f.name for f in fields(SchemeRecord) if f.name not in _TEXT_FIELDS)
+
+# Strict structured-output schema: every key required, nothing else allowed
+SCHEME_RECORD_SCHEMA = {
+    "type": "object",
+    "properties": {
+        **{name: {"type": "string"} for name in _TEXT_FIELDS},
+        **{name: {"type": "array", "items": {"type": "string"}} for name in _LIST_FIELDS},
+    },
+    "required": [f.name for f in fields(SchemeRecord)],
+    "additionalProperties": False,
+}
+
+RECORD_PROMPT = """
+        You are an expert government policy analyst. Extract the key facts of this government scheme document.
+        Write short, plain items. Keep every specific amount, date, age and income limit exactly as stated.
+        Use an empty string or empty list when the document does not mention something. Do not guess.
+
+        - name: official name of the scheme
+        - purpose: one or two sentences on what the scheme aims to achieve
+        - benefits: what beneficiaries receive
+        - eligibility_criteria: one criterion per item
+        - required_documents: one document per item
+        - application_steps: steps in order
+        - deadlines: application deadlines and time limits
+        - amounts: every subsidy, grant or benefit amount with what it is for
+        - contact: helpline, office, website or email
+
+        Document content:
+        {text}
+        """
+
+# Items the model sometimes emits instead of leaving a list empty
+_PLACEHOLDERS = {"", "n/a", "na", "none", "not mentioned", "not specified", "not applicable"}
+
+
+def parse_scheme_record(data: Dict) -> SchemeRecord:
+    """Validate model output against SCHEME_RECORD_SCHEMA; raises ValueError when it doesn't conform"""
+    if not isinstance(data, dict):
+        raise ValueError("scheme record must be a JSON object")
+    missing = [f.name for f in fields(SchemeRecord) if f.name not in data]
+    if missing:
+        raise ValueError(f"scheme record is missing {', '.join(missing)}")
+
+    values = {}
+    for name in _TEXT_FIELDS:
+        if not isinstance(data[name], str):
+            raise ValueError(f"scheme record field {name} must be a string")
+        values[name] = data[name].strip()
+    for name in _LIST_FIELDS:
+        items = data[name]
+        if not isinstance(items, list) or not all(isinstance(item, str) for item in items):
+            raise ValueError(f"scheme record field {name} must be a list of strings")
+        values[name] = [item.strip() for item in items if item.strip().lower().rstrip(".") not in _PLACEHOLDERS]
+
+    if not values["name"] and not values["purpose"]:
+        raise ValueError("scheme record has neither a name nor a purpose")
+    return SchemeRecord(**values)
+
+
+def extract_scheme_record(client, text: str) -> SchemeRecord:
+    """One structured-output call that turns document text into a validated SchemeRecord"""
+    response = client.chat.completions.create(
+        model="gpt-4o-mini",
+        messages=[{"role": "user", "content": RECORD_PROMPT.format(text=text)}],
+        temperature=0.3,
+        response_format={
+            "type": "json_schema",
+            "json_schema": {"name": "scheme_record", "strict": True, "schema": SCHEME_RECORD_SCHEMA},
+        },
+    )
+    return parse_scheme_record(json.loads(response.choices[0].message.content))
+
+
+def _bullets(items: List[str], empty: str = "Not mentioned") -> List[str]:
+    return [f"- {item}" for item in items] or [empty]
+
+
+def render_scheme_markdown(record: SchemeRecord) -> str:
+    """Markdown with the same sections as the free-form LLM summary"""
+    lines = [
+        f"**SCHEME NAME:** {record.name or 'Not mentioned'}", "",
+        f"**PURPOSE:** {record.purpose or 'Not mentioned'}", "",
+        "**KEY BENEFITS:**", *_bullets(record.benefits), "",
+        "**ELIGIBILITY CRITERIA:**", *_bullets(record.eligibility_criteria), "",
+        "**REQUIRED DOCUMENTS:**", *_bullets(record.required_documents), "",
+        "**APPLICATION PROCESS:**",
+        *([f"{i}. {step}" for i, step in enumerate(record.application_steps, 1)] or ["Not mentioned"]), "",
+        "**IMPORTANT DETAILS:**",
+        f"- Application deadline: {'; '.join(record.deadlines) or 'Not mentioned'}",
+        f"- Contact information: {record.contact or 'Not mentioned'}",
+        f"- Subsidy/benefit amount: {'; '.join(record.amounts) or 'Not mentioned'}",
+    ]
+    return "\n".join(lines)
+
+
+def eligibility_details(record: SchemeRecord) -> str:
+    """Compact scheme facts for eligibility prompts and rule compiles; benefits and steps are left out"""
+    lines = [f"Scheme: {record.name}"]
+    lines += [f"Eligibility: {criterion}" for criterion in record.eligibility_criteria]
+    lines += [f"Document: {document}" for document in record.required_documents]
+    return "\n".join(lines)
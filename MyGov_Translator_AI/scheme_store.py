@@ -0,0 +1,170 @@
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import asdict
+from typing import Dict, List, Optional
+
+from pdf_extraction import PageRecord
+from scheme_record import SchemeRecord
+
+
+class SchemeStore:
+    """Content-addressed knowledge base of analyzed schemes in SQLite.
+
+    Everything is keyed by the document's content digest: extracted pages, the validated
+    SchemeRecord and per-language translations. None of it depends on the user, so a
+    document analyzed once is served to every later upload without parsing or LLM calls.
+    Least-recently-used documents are dropped beyond max_documents.
+    """
+
+    def __init__(self, path: str = ":memory:", max_documents: int = 5000):
+        self.path = path
+        self.max_documents = max_documents
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS documents (
+                    digest TEXT PRIMARY KEY,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_documents_accessed ON documents (accessed_at);
+                CREATE TABLE IF NOT EXISTS pages (
+                    digest TEXT NOT NULL,
+                    page_number INTEGER NOT NULL,
+                    text TEXT NOT NULL,
+                    char_count INTEGER NOT NULL,
+                    token_estimate INTEGER NOT NULL,
+                    PRIMARY KEY (digest, page_number)
+                );
+                CREATE TABLE IF NOT EXISTS records (
+                    digest TEXT PRIMARY KEY,
+                    record TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS translations (
+                    digest TEXT NOT NULL,
+                    language TEXT NOT NULL,
+                    source_digest TEXT NOT NULL,
+                    text TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    PRIMARY KEY (digest, language)
+                );
+                """
+            )
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def persistent(self) -> bool:
+        return self.path != ":memory:"
+
+    def _touch(self, digest: str) -> None:
+        now = time.time()
+        self._conn.execute(
+            "INSERT INTO documents (digest, created_at, accessed_at) VALUES (?, ?, ?) "
+            "ON CONFLICT (digest) DO UPDATE SET accessed_at = excluded.accessed_at",
+            (digest, now, now),
+        )
+
+    def _count(self, found: bool) -> None:
+        if found:
+            self.hits += 1
+        else:
+            self.misses += 1
+
+    # --- Pages ---
+
+    def get_pages(self, digest: str) -> Optional[List[PageRecord]]:
+        with self._lock, self._conn:
+            rows = self._conn.execute(
+                "SELECT page_number, text, char_count, token_estimate FROM pages WHERE digest = ? ORDER BY page_number",
+                (digest,),
+            ).fetchall()
+            if rows:
+                self._touch(digest)
+            self._count(bool(rows))
+        return [PageRecord(*row) for row in rows] if rows else None
+
+    def put_pages(self, digest: str, pages: List[PageRecord]) -> None:
+        with self._lock, self._conn:
+            self._touch(digest)
+            self._conn.execute("DELETE FROM pages WHERE digest = ?", (digest,))
+            self._conn.executemany(
+                "INSERT INTO pages (digest, page_number, text, char_count, token_estimate) VALUES (?, ?, ?, ?, ?)",
+                [(digest, page.page_number, page.text, page.char_count, page.token_estimate) for page in pages],
+            )
+            self._evict()
+
+    # --- Structured summary ---
+
+    def get_record(self, digest: str) -> Optional[SchemeRecord]:
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT record FROM records WHERE digest = ?", (digest,)).fetchone()
+            if row is not None:
+                self._touch(digest)
+            self._count(row is not None)
+        return SchemeRecord(**json.loads(row[0])) if row is not None else None
+
+    def has_record(self, digest: str) -> bool:
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM records WHERE digest = ?", (digest,)).fetchone() is not None
+
+    def put_record(self, digest: str, record: SchemeRecord) -> None:
+        with self._lock, self._conn:
+            self._touch(digest)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO records (digest, record, created_at) VALUES (?, ?, ?)",
+                (digest, json.dumps(asdict(record), ensure_ascii=False), time.time()),
+            )
+            self._evict()
+
+    # --- Translations ---
+
+    def get_translation(self, digest: str, language: str, source_digest: str) -> Optional[str]:
+        """Stored translation of this document's text, only if it was made from the same source text"""
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT text FROM translations WHERE digest = ? AND language = ? AND source_digest = ?",
+                (digest, language, source_digest),
+            ).fetchone()
+            if row is not None:
+                self._touch(digest)
+            self._count(row is not None)
+        return row[0] if row is not None else None
+
+    def put_translation(self, digest: str, language: str, source_digest: str, text: str) -> None:
+        with self._lock, self._conn:
+            self._touch(digest)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO translations (digest, language, source_digest, text, created_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (digest, language, source_digest, text, time.time()),
+            )
+            self._evict()
+
+    # --- Housekeeping ---
+
+    def _evict(self) -> None:
+        excess = self._conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0] - self.max_documents
+        if excess <= 0:
+            return
+        doomed = [row for row in self._conn.execute(
+            "SELECT digest FROM documents ORDER BY accessed_at LIMIT ?", (excess,)
+        )]
+        for table in ("pages", "records", "translations", "documents"):
+            self._conn.executemany(f"DELETE FROM {table} WHERE digest = ?", doomed)
+        self.evictions += len(doomed)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            counts = {
+                table: self._conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                for table in ("documents", "records", "translations")
+            }
+            return {**counts, "hits": self.hits, "misses": self.misses, "evictions": self.evictions}
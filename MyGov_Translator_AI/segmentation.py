@@ -0,0 +1,80 @@
+import re
+from typing import Callable, List, Tuple, Union
+
+# Sentence ends: . ! ? (and runs like "..." or "?!") followed by whitespace or the end of the line, or the
+# Devanagari danda / double danda anywhere. Closing quotes and brackets stay with their sentence.
+# Requiring whitespace after "." keeps decimals (₹1.5), URLs and e-mail addresses whole.
+_TERMINATOR = re.compile(r'(?:[.!?]+["\'”’)\]]*(?=\s|$)|[।॥]+["\'”’)\]]*)')
+# Markdown structure kept verbatim in front of a line's text: indentation, headings, quotes, bullets, numbering
+_LINE_PREFIX = re.compile(r'^\s*(?:(?:#{1,6}|>|[-*+•]|\d{1,3}[.)]|\(?[a-z]\))\s+)*')
+# Lines with no letters at all (blank lines, rules, table separators, bare numbers) aren't translated
+_HAS_LETTER = re.compile(r'[^\W\d_]')
+
+# Lower-cased words that end in "." without ending the sentence. Words that often end one too
+# ("etc.", "18 yrs.", "10 a.m.", "Pvt. Ltd.") are left out: the lower-case rule below keeps them
+# whole mid-sentence, and a capitalised word after them starts a new one.
+ABBREVIATIONS = frozenset({
+    "rs", "re", "no", "nos", "sr", "jr", "dr", "mr", "mrs", "ms", "shri", "smt", "kum", "st", "govt", "dept",
+    "min", "max", "approx", "vs", "e.g", "i.e", "viz", "cf", "sec", "art", "cl", "para", "ch", "vol",
+    "pvt", "dist", "ph", "tel", "fig", "ref", "p", "pp", "u.s", "u.k",
+})
+
+
+def _ends_sentence(text: str, start: int, end: int) -> bool:
+    """Whether the terminator at text[start:end] really closes a sentence"""
+    if text[start] != ".":
+        return True
+    word_start = text.rfind(" ", 0, start) + 1
+    word = text[word_start:start].lstrip("(\"'").lower()
+    if word in ABBREVIATIONS or (len(word) == 1 and word.isalpha()):
+        return False
+    # "etc. and": a sentence doesn't start in lower case
+    return not text[end:].lstrip()[:1].islower()
+
+
+def split_sentences(text: str) -> List[str]:
+    """Sentences of a single line of prose, whitespace-trimmed"""
+    sentences = []
+    start = 0
+    for match in _TERMINATOR.finditer(text):
+        if match.end() < len(text) and _ends_sentence(text, match.start(), match.end()):
+            sentence = text[start:match.end()].strip()
+            if sentence:
+                sentences.append(sentence)
+            start = match.end()
+    tail = text[start:].strip()
+    if tail:
+        sentences.append(tail)
+    return sentences
+
+
+def segment_markdown(text: str) -> Tuple[List[str], Callable[[List[str]], str]]:
+    """Translatable sentences of markdown text, plus a function that puts translations back in place.
+
+    Line breaks, blank lines, headings, bullets and numbering survive as they are; only the
+    prose after each line's markdown prefix is split into sentences, which are rejoined with
+    a single space.
+    """
+    segments: List[str] = []
+    layout: List[Union[str, Tuple[str, int]]] = []
+    for line in text.split("\n"):
+        if not _HAS_LETTER.search(line):
+            layout.append(line)
+            continue
+        prefix = _LINE_PREFIX.match(line).group()
+        sentences = split_sentences(" ".join(line[len(prefix):].split()))
+        segments.extend(sentences)
+        layout.append((prefix, len(sentences)))
+
+    def join(translated: List[str]) -> str:
+        parts = iter(translated)
+        lines = []
+        for entry in layout:
+            if isinstance(entry, str):
+                lines.append(entry)
+            else:
+                prefix, count = entry
+                lines.append(prefix + " ".join(next(parts) for _ in range(count)))
+        return "\n".join(lines)
+
+    return segments, join
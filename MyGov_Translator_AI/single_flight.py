@@ -0,0 +1,216 @@
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class _Flight:
+    """One in-flight computation that later callers wait on instead of repeating"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SQLiteLease:
+    """Per-key leases in a SQLite file shared by every process using the same cache directory.
+
+    Leases expire after ttl so a crashed holder cannot block a key forever; holders renew
+    them in the background while their computation runs.
+    """
+
+    def __init__(self, path: str, ttl: float = 60.0, poll_interval: float = 0.25):
+        self.path = path
+        self.ttl = ttl
+        self.poll_interval = poll_interval
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS leases (key TEXT PRIMARY KEY, owner TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+        self.acquired = 0
+        self.waited = 0
+        self.total_wait = 0.0
+
+    def try_acquire(self, key: str) -> Optional[str]:
+        """Take the lease if nobody holds it; returns the owner token or None"""
+        token = uuid.uuid4().hex
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM leases WHERE key = ? AND expires_at < ?", (key, now))
+            inserted = self._conn.execute(
+                "INSERT OR IGNORE INTO leases (key, owner, expires_at) VALUES (?, ?, ?)",
+                (key, token, now + self.ttl),
+            ).rowcount
+        return token if inserted else None
+
+    def acquire(self, key: str, timeout: float) -> Optional[str]:
+        """Poll until the lease is free or timeout passes; returns the owner token or None"""
+        start = time.monotonic()
+        token = self.try_acquire(key)
+        while token is None and time.monotonic() - start < timeout:
+            time.sleep(self.poll_interval)
+            token = self.try_acquire(key)
+        waited = time.monotonic() - start
+        with self._lock:
+            self.acquired += token is not None
+            if waited >= self.poll_interval:
+                self.waited += 1
+                self.total_wait += waited
+        return token
+
+    def renew(self, key: str, token: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE leases SET expires_at = ? WHERE key = ? AND owner = ?", (time.time() + self.ttl, key, token)
+            )
+
+    def release(self, key: str, token: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM leases WHERE key = ? AND owner = ?", (key, token))
+
+    @contextmanager
+    def hold(self, key: str, token: str) -> Iterator[None]:
+        """Keep the lease renewed while the body runs and release it afterwards"""
+        stop = threading.Event()
+
+        def renew_until_stopped():
+            while not stop.wait(self.ttl / 3):
+                try:
+                    self.renew(key, token)
+                except sqlite3.Error as e:
+                    logger.warning(f"Could not renew lease {key}: {str(e)}")
+
+        renewer = threading.Thread(target=renew_until_stopped, name="lease-renew", daemon=True)
+        renewer.start()
+        try:
+            yield
+        finally:
+            stop.set()
+            self.release(key, token)
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                "acquired": self.acquired,
+                "waited_for_other_process": self.waited,
+                "total_wait_s": round(self.total_wait, 3),
+            }
+
+
+class SingleFlight:
+    """Coalesce concurrent calls for the same key onto one computation.
+
+    Within a process, callers arriving while a key is in flight wait for the leader's result.
+    With a lease, processes also take turns per key. A process that waited then runs the work
+    itself, which is cheap when the leader's LLM responses landed in a shared response cache.
+    Nobody waits longer than wait_timeout: a leader that slow is most likely hung, so the
+    caller computes on its own rather than tying up its thread.
+    """
+
+    def __init__(self, lease: Optional[SQLiteLease] = None, wait_timeout: float = 300.0):
+        self.lease = lease
+        self.wait_timeout = wait_timeout
+        self._flights: Dict[str, _Flight] = {}
+        self._lock = threading.Lock()
+        self.leaders = 0
+        self.coalesced = 0
+        self.timed_out = 0
+
+    def _join(self, key: str) -> Tuple[_Flight, bool]:
+        """Return the flight for key and whether this caller leads it"""
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None:
+                self.coalesced += 1
+                return flight, False
+            flight = self._flights[key] = _Flight()
+            self.leaders += 1
+            return flight, True
+
+    def _land(self, key: str, flight: _Flight, result: Any = None, error: Optional[BaseException] = None) -> None:
+        flight.result, flight.error = result, error
+        with self._lock:
+            del self._flights[key]
+        flight.done.set()
+
+    def _wait(self, key: str, flight: _Flight) -> bool:
+        """Wait for the leader; False when it didn't land within wait_timeout"""
+        if flight.done.wait(self.wait_timeout):
+            return True
+        with self._lock:
+            self.timed_out += 1
+        logger.warning(f"{key} still in flight after {self.wait_timeout:.0f}s, computing anyway")
+        return False
+
+    @contextmanager
+    def _cross_process(self, key: str) -> Iterator[None]:
+        token = self.lease.acquire(key, self.wait_timeout) if self.lease is not None else None
+        if token is None:
+            if self.lease is not None:
+                with self._lock:
+                    self.timed_out += 1
+                logger.warning(f"Lease for {key} still held after {self.wait_timeout:.0f}s, computing anyway")
+            yield
+            return
+        with self.lease.hold(key, token):
+            yield
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """Return fn(), sharing one call among everyone asking for key at the same time"""
+        flight, leader = self._join(key)
+        if not leader:
+            if not self._wait(key, flight):
+                return fn()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            with self._cross_process(key):
+                result = fn()
+        except BaseException as e:
+            self._land(key, flight, error=e)
+            raise
+        self._land(key, flight, result=result)
+        return result
+
+    def stream(self, key: str, produce: Callable[[], Iterator[str]]) -> Iterator[str]:
+        """Streaming variant: the leader yields chunks as they arrive, followers get the joined text at the end"""
+        flight, leader = self._join(key)
+        if not leader:
+            if self._wait(key, flight) and flight.error is None:
+                yield flight.result
+            else:
+                # The leader hung, failed or its reader went away mid-stream; start over independently
+                yield from produce()
+            return
+
+        chunks = []
+        try:
+            with self._cross_process(key):
+                for chunk in produce():
+                    chunks.append(chunk)
+                    yield chunk
+        except BaseException as e:
+            self._land(key, flight, error=e)
+            raise
+        self._land(key, flight, result="".join(chunks))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = {
+                "in_flight": len(self._flights), "leaders": self.leaders, "coalesced": self.coalesced,
+                "timed_out": self.timed_out,
+            }
+        if self.lease is not None:
+            stats["lease"] = self.lease.stats()
+        return stats
@@ -0,0 +1,60 @@
+import csv
+import io
+import unittest
+
+from bulk_screening import PROFILE_FIELDS, screen_csv
+from eligibility_rules import evaluate_rules, parse_rules
+
+PROFILES = [
+    {"age": "30", "gender": "Female", "income": "₹1-3 Lakhs", "category": "SC", "state": "Bihar",
+     "occupation": "Farmer", "education": "Graduate"},
+    {"age": "70", "gender": "Male", "income": "Above ₹20 Lakhs", "category": "General", "state": "Goa",
+     "occupation": "Farmer", "education": "Graduate"},
+    {"age": "", "gender": "female", "income": "Below ₹1 Lakh", "category": "ST", "state": "Kerala",
+     "occupation": "Farmer", "education": "Graduate"},
+    {"age": "40", "gender": "Other", "income": "₹1-3 Lakhs", "category": "Unknown", "state": "Bihar",
+     "occupation": "Farmer", "education": "Graduate"},
+]
+
+
+def _screen(rules, profiles=PROFILES):
+    infile = io.StringIO()
+    writer = csv.DictWriter(infile, fieldnames=PROFILE_FIELDS + ["name"])
+    writer.writeheader()
+    writer.writerows(dict(profile, name=f"p{i}") for i, profile in enumerate(profiles))
+    infile.seek(0)
+    outfile = io.StringIO()
+    counts = screen_csv(rules, infile, outfile, chunk_size=3)
+    return counts, list(csv.DictReader(io.StringIO(outfile.getvalue())))
+
+
+class ScreenCsvTest(unittest.TestCase):
+    def test_matches_evaluate_rules(self):
+        rules = parse_rules({"min_age": 18, "max_age": 60, "max_annual_income": 300000, "categories": ["SC", "ST"]})
+        counts, rows = _screen(rules)
+        self.assertEqual([row["eligibility_status"] for row in rows],
+                         ["ELIGIBLE", "NOT ELIGIBLE", "NEEDS REVIEW", "NEEDS REVIEW"])
+        self.assertEqual(rows[1]["failed_criteria"], "Age; Income; Category")
+        self.assertEqual(counts, {"ELIGIBLE": 1, "NOT ELIGIBLE": 1, "NEEDS REVIEW": 2})
+        self.assertEqual(
+            evaluate_rules(rules, dict(PROFILES[0], age=30)).status, rows[0]["eligibility_status"]
+        )
+
+    def test_extra_columns_stay_aligned(self):
+        _, rows = _screen(parse_rules({"min_age": 18}))
+        self.assertEqual([row["name"] for row in rows], ["p0", "p1", "p2", "p3"])
+        self.assertEqual(rows[1]["state"], "Goa")
+
+    def test_unresolved_or_empty_rules_never_screen_eligible(self):
+        for rules in (parse_rules({}), parse_rules({"max_age": 60, "unresolved_criteria": ["Must own land"]})):
+            counts, rows = _screen(rules)
+            self.assertEqual(counts["ELIGIBLE"], 0)
+        self.assertEqual(rows[1]["eligibility_status"], "NOT ELIGIBLE")
+
+    def test_missing_profile_column_is_rejected(self):
+        with self.assertRaises(ValueError):
+            screen_csv(parse_rules({}), io.StringIO("age,gender\n30,Female\n"), io.StringIO())
+
+
+if __name__ == "__main__":
+    unittest.main()
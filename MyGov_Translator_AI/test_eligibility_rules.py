@@ -0,0 +1,90 @@
+import math
+import unittest
+
+from eligibility_rules import FAIL, PASS, evaluate_rules, parse_rules
+
+PROFILE = {
+    "age": 30,
+    "gender": "Female",
+    "income": "₹1-3 Lakhs",
+    "category": "SC",
+    "state": "Bihar",
+    "occupation": "Farmer",
+    "education": "Graduate",
+}
+
+
+class ParseRulesTest(unittest.TestCase):
+    def test_numbers_and_vocabulary_values_are_kept(self):
+        rules = parse_rules({
+            "min_age": 18, "max_age": "60", "max_annual_income": 250000.0,
+            "genders": ["Female"], "categories": ["SC", "ST"], "min_education": "High School",
+        })
+        self.assertEqual((rules.min_age, rules.max_age, rules.max_annual_income), (18, 60, 250000.0))
+        self.assertEqual(rules.genders, ["Female"])
+        self.assertEqual(rules.categories, ["SC", "ST"])
+        self.assertEqual(rules.min_education, "High School")
+        self.assertEqual(rules.unresolved_criteria, [])
+
+    def test_unreadable_numbers_are_unresolved(self):
+        rules = parse_rules({"min_age": "21 years", "max_annual_income": "2.5 lakh", "categories": ["SC", "ST"]})
+        self.assertIsNone(rules.min_age)
+        self.assertIsNone(rules.max_annual_income)
+        self.assertEqual(rules.unresolved_criteria, ["Minimum age: 21 years", "Income limit: 2.5 lakh"])
+
+    def test_non_finite_and_boolean_numbers_are_unresolved(self):
+        rules = parse_rules({"min_age": math.nan, "max_age": math.inf, "max_annual_income": True})
+        self.assertEqual((rules.min_age, rules.max_age, rules.max_annual_income), (None, None, None))
+        self.assertEqual(len(rules.unresolved_criteria), 3)
+
+    def test_scalar_list_criterion_is_unresolved_whole(self):
+        rules = parse_rules({"genders": "Female"})
+        self.assertEqual(rules.genders, [])
+        self.assertEqual(rules.unresolved_criteria, ["Gender: Female"])
+
+    def test_partly_unmapped_list_is_unresolved_whole(self):
+        rules = parse_rules({"occupations": ["Farmer", "Fisherman"]})
+        self.assertEqual(rules.occupations, [])
+        self.assertEqual(rules.unresolved_criteria, ["Occupation: Farmer, Fisherman"])
+
+    def test_unknown_education_is_unresolved(self):
+        rules = parse_rules({"min_education": "Diploma"})
+        self.assertIsNone(rules.min_education)
+        self.assertEqual(rules.unresolved_criteria, ["Education: Diploma"])
+
+
+class EvaluateRulesTest(unittest.TestCase):
+    def test_unreadable_criteria_are_not_conclusive(self):
+        rules = parse_rules({"min_age": "21 years", "max_annual_income": "2.5 lakh", "categories": ["SC", "ST"]})
+        result = evaluate_rules(rules, dict(PROFILE, age=12, income="Above ₹20 Lakhs"))
+        self.assertIsNone(result.status)
+        self.assertFalse(result.is_conclusive)
+
+    def test_all_checks_pass(self):
+        rules = parse_rules({"min_age": 18, "max_annual_income": 300000, "categories": ["SC", "ST"]})
+        result = evaluate_rules(rules, PROFILE)
+        self.assertEqual([check.outcome for check in result.checks], [PASS, PASS, PASS])
+        self.assertEqual(result.status, "ELIGIBLE")
+
+    def test_any_failed_check_is_conclusive(self):
+        rules = parse_rules({"max_age": 25, "unresolved_criteria": ["Must own agricultural land"]})
+        result = evaluate_rules(rules, PROFILE)
+        self.assertEqual([check.outcome for check in result.failed], [FAIL])
+        self.assertEqual(result.status, "NOT ELIGIBLE")
+
+    def test_straddling_income_bracket_is_not_conclusive(self):
+        rules = parse_rules({"max_annual_income": 200000})
+        self.assertIsNone(evaluate_rules(rules, PROFILE).status)
+
+    def test_unspecified_profile_answer_is_not_conclusive(self):
+        rules = parse_rules({"genders": ["Female"]})
+        self.assertIsNone(evaluate_rules(rules, dict(PROFILE, gender="Prefer not to say")).status)
+
+    def test_education_rank(self):
+        rules = parse_rules({"min_education": "Post Graduate"})
+        self.assertEqual(evaluate_rules(rules, PROFILE).status, "NOT ELIGIBLE")
+        self.assertEqual(evaluate_rules(rules, dict(PROFILE, education="Professional Degree")).status, "ELIGIBLE")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+
+from pdf_extraction import (
+    PageRecord, fit_pages_to_budget, format_pages, formatted_token_count, parse_pages, split_into_chunks,
+)
+from tokenizer import count_tokens
+
+
+def _page(page_number, text):
+    return PageRecord(page_number, text, len(text), count_tokens(text))
+
+
+PAGES = [
+    _page(1, "The scheme supports farmers. It pays a yearly grant."),
+    _page(2, "Applicants must own land. They must hold an Aadhaar card. Apply online."),
+    _page(3, "Contact the district office for help."),
+]
+
+
+class PageFormattingTest(unittest.TestCase):
+    def test_formatted_token_count_matches_the_text(self):
+        # Summed per piece, so a token may split differently at each page boundary
+        self.assertAlmostEqual(formatted_token_count(PAGES), count_tokens(format_pages(PAGES)), delta=len(PAGES))
+
+    def test_parse_pages_inverts_format_pages(self):
+        self.assertEqual(parse_pages(format_pages(PAGES)), PAGES)
+
+
+class FitPagesToBudgetTest(unittest.TestCase):
+    def test_everything_fits(self):
+        self.assertEqual(fit_pages_to_budget(PAGES, formatted_token_count(PAGES)), format_pages(PAGES))
+
+    def test_last_page_is_cut_on_a_sentence_boundary(self):
+        budget = formatted_token_count(PAGES[:1]) + count_tokens("\n--- Page 2 ---\nApplicants must own land. ")
+        text = fit_pages_to_budget(PAGES, budget)
+        self.assertEqual(text, format_pages(PAGES[:1]) + "\n--- Page 2 ---\nApplicants must own land. ")
+        self.assertLessEqual(count_tokens(text), budget)
+
+    def test_first_page_without_boundaries_is_cut_by_length(self):
+        page = _page(1, "word " * 400)
+        text = fit_pages_to_budget([page], 50)
+        self.assertTrue(text.startswith("\n--- Page 1 ---\nword"))
+        self.assertLessEqual(count_tokens(text), 60)
+
+
+class SplitIntoChunksTest(unittest.TestCase):
+    def test_paragraphs_are_packed_up_to_the_limit(self):
+        paragraphs = [f"Paragraph {i} about the scheme." for i in range(6)]
+        limit = count_tokens(paragraphs[0]) * 2
+        chunks = split_into_chunks("\n\n".join(paragraphs), max_tokens=limit)
+        self.assertEqual(len(chunks), 3)
+        self.assertEqual(chunks[0], "\n\n".join(paragraphs[:2]))
+
+    def test_oversized_paragraph_is_hard_split(self):
+        chunks = split_into_chunks("योजना " * 500, max_tokens=100)
+        self.assertGreater(len(chunks), 1)
+        self.assertTrue(all(count_tokens(chunk) <= 110 for chunk in chunks))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+import unittest
+
+from relevance import BM25Index, Chunk, format_chunks, select_relevant_chunks, tokenize_terms
+
+
+def _chunk(page_number, text, tokens=10):
+    return Chunk(page_number, text, tokens)
+
+
+class BM25IndexTest(unittest.TestCase):
+    def test_ranks_matching_texts_best_first(self):
+        index = BM25Index([
+            "The scheme was launched in 2015.",
+            "Documents required: Aadhaar card and bank passbook.",
+            "Aadhaar card is required for every applicant.",
+        ])
+        self.assertEqual(index.rank("documents aadhaar passbook"), [1, 2])
+        self.assertEqual(index.rank("pension"), [])
+
+    def test_devanagari_terms_keep_their_vowel_signs(self):
+        self.assertEqual(tokenize_terms("पात्रता की शर्तें।"), ["पात्रता", "की", "शर्तें"])
+
+
+class SelectRelevantChunksTest(unittest.TestCase):
+    def setUp(self):
+        self.chunks = [
+            _chunk(1, "Pradhan Mantri Kisan scheme overview."),
+            _chunk(2, "History of agriculture in the region."),
+            _chunk(3, "Benefit: financial assistance of Rs 6000 per annum."),
+            _chunk(4, "Eligibility: applicant age and family income criteria."),
+            _chunk(5, "Documents required: Aadhaar card and bank account passbook."),
+        ]
+
+    def test_every_section_gets_evidence_in_document_order(self):
+        selected = select_relevant_chunks(self.chunks, max_tokens=40)
+        self.assertEqual([chunk.page_number for chunk in selected], [1, 3, 4, 5])
+
+    def test_budget_is_respected(self):
+        selected = select_relevant_chunks(self.chunks, max_tokens=25)
+        self.assertLessEqual(sum(chunk.tokens for chunk in selected), 25)
+        self.assertEqual(selected[0].page_number, 1)
+
+    def test_format_chunks_marks_each_page_once(self):
+        text = format_chunks([_chunk(2, "a"), _chunk(2, "b"), _chunk(3, "c")])
+        self.assertEqual(text, "\n--- Page 2 ---\na\n\nb\n--- Page 3 ---\nc")
+
+
+if __name__ == "__main__":
+    unittest.main()
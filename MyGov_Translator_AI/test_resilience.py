@@ -0,0 +1,86 @@
+import unittest
+
+import openai
+
+from resilience import RATE_LIMIT, CircuitBreaker, CircuitOpenError, ResilientChatCompletions, RetryPolicy
+
+
+def _error(cls, status_code=None):
+    # Built without __init__, which wants an httpx request/response
+    error = cls.__new__(cls)
+    if status_code is not None:
+        error.status_code = status_code
+    return error
+
+
+class FlakyCompletions:
+    def __init__(self, errors):
+        self.errors = list(errors)
+        self.calls = 0
+
+    def create(self, **kwargs):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return "ok"
+
+
+class CircuitBreakerTest(unittest.TestCase):
+    def test_opens_after_consecutive_failures(self):
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+        breaker.record_failure()
+        breaker.before_call()
+        breaker.record_failure()
+        self.assertEqual(breaker.state, "open")
+        self.assertRaises(CircuitOpenError, breaker.before_call)
+        self.assertEqual(breaker.trips, 1)
+
+    def test_success_resets_the_count(self):
+        breaker = CircuitBreaker(failure_threshold=2)
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        self.assertEqual(breaker.state, "closed")
+
+    def test_half_open_lets_one_probe_through(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+        breaker.record_failure()
+        self.assertEqual(breaker.state, "half-open")
+        breaker.before_call()
+        self.assertRaises(CircuitOpenError, breaker.before_call)
+        breaker.record_failure()
+        self.assertEqual(breaker.trips, 2)
+        breaker.before_call()
+        breaker.record_success()
+        self.assertEqual(breaker.state, "closed")
+
+
+class ResilientChatCompletionsTest(unittest.TestCase):
+    def _completions(self, errors, max_attempts=4):
+        return ResilientChatCompletions(
+            FlakyCompletions(errors),
+            policy=RetryPolicy(max_attempts=max_attempts, base_delay=0, max_delay=0),
+            breaker=CircuitBreaker(failure_threshold=2, reset_timeout=60),
+        )
+
+    def test_rate_limits_are_retried_without_tripping_the_breaker(self):
+        completions = self._completions([_error(openai.RateLimitError, 429)] * 3)
+        self.assertEqual(completions.create(model="m"), "ok")
+        self.assertEqual(completions.retries[RATE_LIMIT], 3)
+        self.assertEqual(completions.breaker.state, "closed")
+
+    def test_server_errors_trip_the_breaker(self):
+        completions = self._completions([_error(openai.APIStatusError, 503)] * 3, max_attempts=2)
+        self.assertRaises(openai.APIStatusError, completions.create, model="m")
+        self.assertEqual(completions.breaker.state, "open")
+        self.assertRaises(CircuitOpenError, completions.create, model="m")
+
+    def test_client_errors_are_not_retried(self):
+        completions = self._completions([_error(openai.BadRequestError, 400)])
+        self.assertRaises(openai.BadRequestError, completions.create, model="m")
+        self.assertEqual(completions._completions.calls, 1)
+        self.assertEqual(completions.breaker.state, "closed")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+
+from segmentation import segment_markdown, split_sentences
+
+
+class SplitSentencesTest(unittest.TestCase):
+    def test_sentence_after_an_amount(self):
+        self.assertEqual(
+            split_sentences("The grant is ₹2.5 lakh. 3 documents are required."),
+            ["The grant is ₹2.5 lakh.", "3 documents are required."],
+        )
+
+    def test_sentence_after_a_unit(self):
+        self.assertEqual(
+            split_sentences("Applicants must be 18 yrs. Income must be below ₹3 lakh."),
+            ["Applicants must be 18 yrs.", "Income must be below ₹3 lakh."],
+        )
+
+    def test_abbreviations_and_decimals_stay_whole(self):
+        for text in (
+            "Pay Rs. 500 at the office.",
+            "Contact Dr. Sharma or Smt. Devi before 5 p.m. on Friday.",
+            "Seeds, tools etc. are covered under Sec. 4 of the rules.",
+            "The rate is 1.5 per cent, see www.example.gov.in for details.",
+        ):
+            self.assertEqual(split_sentences(text), [text])
+
+    def test_danda_ends_a_sentence_without_a_space(self):
+        self.assertEqual(split_sentences("योजना शुरू हुई।आवेदन करें।"), ["योजना शुरू हुई।", "आवेदन करें।"])
+
+    def test_closing_quotes_stay_with_their_sentence(self):
+        self.assertEqual(split_sentences('He said "apply now." Then he left.'), ['He said "apply now."', "Then he left."])
+
+
+class SegmentMarkdownTest(unittest.TestCase):
+    def test_layout_round_trips(self):
+        text = "## Benefits\n\n- Free seeds. Free tools.\n1. Apply online.\n---\n| 1 | 2 |"
+        segments, join = segment_markdown(text)
+        self.assertEqual(segments, ["Benefits", "Free seeds.", "Free tools.", "Apply online."])
+        self.assertEqual(join(segments), text)
+
+    def test_translations_are_put_back_in_place(self):
+        segments, join = segment_markdown("> Note. Read   this.")
+        self.assertEqual(join([s.upper() for s in segments]), "> NOTE. READ THIS.")
+
+
+if __name__ == "__main__":
+    unittest.main()
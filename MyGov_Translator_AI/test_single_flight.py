@@ -0,0 +1,60 @@
+import threading
+import time
+import unittest
+
+from single_flight import SingleFlight
+
+
+class SingleFlightTest(unittest.TestCase):
+    def lead(self, flight: SingleFlight, release: threading.Event, result: str = "leader") -> threading.Thread:
+        """Start a leader for key "k" that finishes once release is set"""
+        started = threading.Event()
+
+        def work():
+            started.set()
+            release.wait(5)
+            return result
+
+        leader = threading.Thread(target=lambda: flight.do("k", work))
+        leader.start()
+        started.wait(5)
+        self.addCleanup(leader.join)
+        self.addCleanup(release.set)
+        return leader
+
+    def test_followers_share_the_leaders_result(self):
+        flight = SingleFlight(wait_timeout=5)
+        release = threading.Event()
+        self.lead(flight, release)
+        threading.Timer(0.05, release.set).start()
+        self.assertEqual(flight.do("k", lambda: "follower"), "leader")
+        self.assertEqual(flight.stats()["coalesced"], 1)
+
+    def test_followers_compute_locally_when_the_leader_hangs(self):
+        flight = SingleFlight(wait_timeout=0.1)
+        self.lead(flight, threading.Event())
+        start = time.monotonic()
+        self.assertEqual(flight.do("k", lambda: "follower"), "follower")
+        self.assertEqual(list(flight.stream("k", lambda: iter(["a", "b"]))), ["a", "b"])
+        self.assertLess(time.monotonic() - start, 2)
+        self.assertEqual(flight.stats()["timed_out"], 2)
+
+    def test_leader_errors_reach_followers(self):
+        flight = SingleFlight(wait_timeout=5)
+        release = threading.Event()
+
+        def fail():
+            release.wait(5)
+            raise ValueError("boom")
+
+        leader = threading.Thread(target=lambda: self.assertRaises(ValueError, flight.do, "k", fail))
+        leader.start()
+        time.sleep(0.05)
+        threading.Timer(0.05, release.set).start()
+        with self.assertRaises(ValueError):
+            flight.do("k", lambda: "follower")
+        leader.join()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import unittest
+from unittest import mock
+
+import translation
+from translation import BATCH, PROBE, SINGLE, BatchStats, pack_batches, translate_segments
+
+
+class EchoBackend:
+    """Translates by upper-casing; collapse_newlines joins lines like a backend that loses them"""
+
+    def __init__(self, name: str, collapse_newlines: bool = False):
+        self.name = name
+        self.target = "te"
+        self.collapse_newlines = collapse_newlines
+        self.requests = []
+
+    def translate(self, text: str) -> str:
+        self.requests.append(text)
+        return " ".join(text.split("\n")).upper() if self.collapse_newlines else text.upper()
+
+
+SEGMENTS = [f"Sentence number {i} of the scheme." for i in range(40)]
+
+
+class TranslateSegmentsTest(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(translation, "batch_stats", BatchStats(min_batches=3))
+        self.stats = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def translate(self, backend: EchoBackend):
+        # Small batches so one call has several of them
+        return translate_segments(SEGMENTS, "te", translator=backend, max_chars=400, max_workers=1)
+
+    def test_probes_until_batches_come_back_aligned(self):
+        backend = EchoBackend("aligned")
+        key = translation.backend_key(backend)
+        batches = pack_batches(SEGMENTS, 400)
+        self.assertEqual(self.stats.mode(key), PROBE)
+
+        result = self.translate(backend)
+        self.assertEqual(result.segments, [segment.upper() for segment in SEGMENTS])
+        # One batch as the probe, every other segment on its own
+        self.assertEqual(result.requests, 1 + len(SEGMENTS) - len(batches[0]))
+
+        self.translate(backend)
+        self.translate(backend)
+        self.assertEqual(self.stats.mode(key), BATCH)
+        self.assertEqual(self.translate(backend).requests, len(batches))
+
+    def test_lost_newlines_fall_back_to_single_segments(self):
+        backend = EchoBackend("collapsing", collapse_newlines=True)
+        key = translation.backend_key(backend)
+        for _ in range(3):
+            result = self.translate(backend)
+            self.assertEqual(result.segments, [segment.upper() for segment in SEGMENTS])
+            self.assertTrue(result.complete)
+        self.assertEqual(self.stats.mode(key), SINGLE)
+        self.assertEqual(self.stats.stats()["mismatch_rate"], 1.0)
+        self.assertEqual(self.translate(backend).requests, len(SEGMENTS))
+
+    def test_failed_batch_keeps_source_text(self):
+        backend = EchoBackend("failing")
+        backend.translate = mock.Mock(side_effect=ConnectionError("down"))
+        result = self.translate(backend)
+        self.assertFalse(result.complete)
+        self.assertEqual(result.segments, SEGMENTS)
+
+
+class PackBatchesTest(unittest.TestCase):
+    def test_batches_stay_under_the_limit_and_in_order(self):
+        batches = pack_batches(SEGMENTS, 400)
+        self.assertEqual([i for batch in batches for i in batch], list(range(len(SEGMENTS))))
+        for batch in batches:
+            self.assertLessEqual(len("\n".join(SEGMENTS[i] for i in batch)), 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+
+from translation_memory import TranslationMemory
+
+
+class TranslationMemoryTest(unittest.TestCase):
+    def setUp(self):
+        self.memory = TranslationMemory()
+
+    def assertNoFuzzyReuse(self, stored: str, lookup: str):
+        self.memory.add(stored, "hi", f"translation of: {stored}")
+        self.assertIsNone(self.memory.lookup(lookup, "hi"))
+
+    def test_exact_match(self):
+        self.memory.add("Aadhaar card is required.", "hi", "आधार कार्ड आवश्यक है।")
+        match = self.memory.lookup("  aadhaar card is   required.", "hi")
+        self.assertTrue(match.exact)
+        self.assertEqual(match.target, "आधार कार्ड आवश्यक है।")
+
+    def test_fuzzy_match_differs_only_in_punctuation_and_markup(self):
+        self.memory.add("Applicants must submit an income certificate issued by the Tehsildar.", "hi", "target")
+        match = self.memory.lookup("**Applicants must submit an income certificate issued by the Tehsildar**", "hi")
+        self.assertIsNotNone(match)
+        self.assertFalse(match.exact)
+
+    def test_short_segments_match_without_punctuation_and_markup(self):
+        self.memory.add("Aadhaar card.", "hi", "आधार कार्ड।")
+        for variant in ("**Aadhaar card**", "Aadhaar card:", "- Aadhaar  card"):
+            self.assertEqual(self.memory.lookup(variant, "hi").target, "आधार कार्ड।")
+
+    def test_segments_without_words_never_match(self):
+        self.memory.add("---", "hi", "---")
+        self.assertIsNone(self.memory.lookup("***", "hi"))
+
+    def test_category_is_not_reused(self):
+        self.assertNoFuzzyReuse(
+            "Applicants from the SC category must submit a caste certificate.",
+            "Applicants from the ST category must submit a caste certificate.",
+        )
+
+    def test_gender_is_not_reused(self):
+        self.assertNoFuzzyReuse(
+            "The applicant must be a female resident of the state.",
+            "The applicant must be a male resident of the state.",
+        )
+
+    def test_document_is_not_reused(self):
+        self.assertNoFuzzyReuse(
+            "Income certificate issued by the Tehsildar of the district.",
+            "Caste certificate issued by the Tehsildar of the district.",
+        )
+
+    def test_amount_and_negation_are_not_reused(self):
+        self.assertNoFuzzyReuse("Annual family income below Rs 2 lakh.", "Annual family income below Rs 3 lakh.")
+        self.assertNoFuzzyReuse("Applicants must own agricultural land.", "Applicants must not own agricultural land.")
+
+    def test_languages_are_separate(self):
+        self.memory.add("Aadhaar card is required.", "hi", "आधार कार्ड आवश्यक है।")
+        self.assertIsNone(self.memory.lookup("Aadhaar card is required.", "te"))
+
+
+if __name__ == "__main__":
+    unittest.main()
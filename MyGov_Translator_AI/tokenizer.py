@@ -0,0 +1,72 @@
+import hashlib
+import logging
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+MODEL = "gpt-4o-mini"
+# MODEL's byte-pair encoding
+ENCODING = "o200k_base"
+
+# tiktoken downloads an encoding's BPE file on first use. Counting must never wait on the network,
+# so the file is read only from this directory (tiktoken's cache layout), filled at build time
+# with `python tokenizer.py`; without it the offline estimate below is used.
+TIKTOKEN_CACHE_DIR = os.environ.setdefault(
+    "TIKTOKEN_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "tiktoken_cache")
+)
+_ENCODING_URL = f"https://openaipublic.blob.core.windows.net/encodings/{ENCODING}.tiktoken"
+
+# Byte-pair encoders pack English into ~4 characters per token but Indic scripts into far fewer
+# characters per token; these ratios keep the offline estimate on the safe (over-counting) side.
+ASCII_CHARS_PER_TOKEN = 4
+OTHER_CHARS_PER_TOKEN = 2
+
+_encoding = None
+_encoding_lock = threading.Lock()
+_encoding_loaded = False
+
+
+def _bundled_encoding_path() -> str:
+    # tiktoken names cached files by the SHA-1 of their URL
+    return os.path.join(TIKTOKEN_CACHE_DIR, hashlib.sha1(_ENCODING_URL.encode()).hexdigest())
+
+
+def _get_encoding():
+    """The model's tiktoken encoding when tiktoken and the bundled BPE file are available, else None"""
+    global _encoding, _encoding_loaded
+    with _encoding_lock:
+        if not _encoding_loaded:
+            _encoding_loaded = True
+            if not os.path.exists(_bundled_encoding_path()):
+                logger.info(f"No {ENCODING} file in {TIKTOKEN_CACHE_DIR}, using the offline token estimate")
+                return None
+            try:
+                import tiktoken
+                _encoding = tiktoken.get_encoding(ENCODING)
+            except Exception as e:
+                logger.info(f"tiktoken unavailable, using the offline token estimate: {str(e)}")
+        return _encoding
+
+
+def heuristic_token_count(text: str) -> int:
+    """Script-aware token estimate that needs no tokenizer files"""
+    ascii_chars = len(text.encode("ascii", "ignore"))
+    other_chars = len(text) - ascii_chars
+    return -(-ascii_chars // ASCII_CHARS_PER_TOKEN) - (-other_chars // OTHER_CHARS_PER_TOKEN)
+
+
+def count_tokens(text: str) -> int:
+    """Count prompt tokens for MODEL locally, exactly when the bundled encoding is usable"""
+    encoding = _get_encoding()
+    if encoding is None:
+        return heuristic_token_count(text)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+if __name__ == "__main__":
+    # Build step: download the encoding into TIKTOKEN_CACHE_DIR
+    import tiktoken
+    tiktoken.get_encoding(ENCODING)
+    print(f"{ENCODING} cached in {TIKTOKEN_CACHE_DIR}")
@@ -0,0 +1,268 @@
+import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Set, TypeVar
+
+from translation_backends import GoogleBackend
+from translation_memory import TranslationMemory, normalize_segment
+
+logger = logging.getLogger(__name__)
+
+
+# Google's web endpoint rejects payloads over 5000 characters; leave headroom for the delimiters
+GOOGLE_MAX_CHARS = 4500
+
+# Segments are flattened to a single line, so a newline can never appear inside one and
+# the backend keeps line breaks in place; a count mismatch still triggers a per-segment retry
+BATCH_DELIMITER = "\n"
+
+# Requests in flight per backend across all callers; a backend can override it with a `concurrency` attribute
+DEFAULT_CONCURRENCY = int(os.getenv("MYGOV_TRANSLATE_CONCURRENCY", "4"))
+
+# How a call groups its segments into requests (see BatchStats)
+BATCH, PROBE, SINGLE = "batch", "probe", "single"
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+_limits: Dict[str, threading.BoundedSemaphore] = {}
+_limits_lock = threading.Lock()
+
+
+class BatchStats:
+    """Outcomes of multi-segment requests per backend, and whether batching pays off for it.
+
+    Batching relies on the backend keeping the newlines between segments, which nothing but
+    the backend's answers can confirm. So a backend starts out probing: each call batches
+    only its first group of segments and sends the rest singly. Once min_batches recent
+    batches show at most trust_misaligned of them misaligned, every call is batched. A
+    misaligned batch costs the batch plus one request per segment, so when most recent
+    batches come back misaligned, the backend gets single-segment requests for cooldown
+    seconds and then starts probing again.
+    """
+
+    def __init__(self, window: int = 20, min_batches: int = 5, trust_misaligned: float = 0.1,
+                 max_misaligned: float = 0.5, cooldown: float = 600.0):
+        self.window = window
+        self.min_batches = min_batches
+        self.trust_misaligned = trust_misaligned
+        self.max_misaligned = max_misaligned
+        self.cooldown = cooldown
+        self._recent: Dict[str, deque] = {}
+        self._trusted: Set[str] = set()
+        self._disabled_until: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self.counts = {"aligned": 0, "misaligned": 0, "failed": 0}
+
+    def record(self, backend: str, outcome: str) -> None:
+        with self._lock:
+            self.counts[outcome] += 1
+            if outcome == "failed":
+                return
+            recent = self._recent.setdefault(backend, deque(maxlen=self.window))
+            recent.append(outcome == "misaligned")
+            if len(recent) < self.min_batches:
+                return
+            rate = sum(recent) / len(recent)
+            if rate > self.max_misaligned:
+                logger.warning(f"Batches to {backend} keep coming back misaligned; sending segments singly")
+                self._disabled_until[backend] = time.monotonic() + self.cooldown
+                self._trusted.discard(backend)
+                recent.clear()
+            elif rate <= self.trust_misaligned and backend not in self._trusted:
+                logger.info(f"Batches to {backend} come back aligned; batching every call")
+                self._trusted.add(backend)
+
+    def mode(self, backend: str) -> str:
+        """BATCH, PROBE or SINGLE for the next call to backend"""
+        with self._lock:
+            if time.monotonic() < self._disabled_until.get(backend, 0.0):
+                return SINGLE
+            return BATCH if backend in self._trusted else PROBE
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            answered = self.counts["aligned"] + self.counts["misaligned"]
+            now = time.monotonic()
+            return {
+                **self.counts,
+                "mismatch_rate": round(self.counts["misaligned"] / answered, 3) if answered else 0.0,
+                "batching_on": sorted(self._trusted),
+                "batching_off": sorted(name for name, until in self._disabled_until.items() if until > now),
+            }
+
+
+batch_stats = BatchStats()
+
+
+def _flatten(segment: str) -> str:
+    return " ".join(segment.split())
+
+
+def pack_batches(segments: List[str], max_chars: int = GOOGLE_MAX_CHARS) -> List[List[int]]:
+    """Group segment indices into batches whose joined length stays under max_chars"""
+    batches: List[List[int]] = []
+    current: List[int] = []
+    current_len = 0
+    for i, segment in enumerate(segments):
+        added = len(segment) + (len(BATCH_DELIMITER) if current else 0)
+        if current and current_len + added > max_chars:
+            batches.append(current)
+            current, current_len = [], 0
+            added = len(segment)
+        current.append(i)
+        current_len += added
+    if current:
+        batches.append(current)
+    return batches
+
+
+def backend_key(translator) -> str:
+    return f"{getattr(translator, 'name', type(translator).__name__)}:{getattr(translator, 'target', '')}"
+
+
+def backend_limit(translator) -> threading.BoundedSemaphore:
+    """Process-wide semaphore shared by every caller of the same backend and target language"""
+    name = backend_key(translator)
+    with _limits_lock:
+        if name not in _limits:
+            _limits[name] = threading.BoundedSemaphore(getattr(translator, "concurrency", DEFAULT_CONCURRENCY))
+        return _limits[name]
+
+
+def map_ordered(fn: Callable[[T], R], items: List[T], translator, max_workers: Optional[int] = None) -> List[R]:
+    """Run fn over items on a bounded thread pool under the backend's limit; results keep input order"""
+    limit = backend_limit(translator)
+
+    def guarded(item: T) -> R:
+        with limit:
+            return fn(item)
+
+    workers = min(max_workers or DEFAULT_CONCURRENCY, len(items))
+    if workers <= 1:
+        return [guarded(item) for item in items]
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="translate") as pool:
+        return list(pool.map(guarded, items))
+
+
+@dataclass
+class SegmentTranslation:
+    """Translated segments in input order; fallbacks counts segments that kept their source text"""
+    segments: List[str]
+    fallbacks: int = 0
+    requests: int = 0
+
+    @property
+    def complete(self) -> bool:
+        return self.fallbacks == 0
+
+
+def _translate_one(translator, segment: str) -> Optional[str]:
+    try:
+        return translator.translate(segment) or None
+    except Exception as e:
+        logger.warning(f"Segment translation failed, keeping source text: {str(e)}")
+        return None
+
+
+def translate_segments(
+    segments: List[str],
+    target: str,
+    translator=None,
+    max_chars: int = GOOGLE_MAX_CHARS,
+    memory: Optional[TranslationMemory] = None,
+    max_workers: Optional[int] = None,
+    namespace: Optional[str] = None,
+) -> SegmentTranslation:
+    """Translate segments in as few requests as possible, returning results in input order.
+
+    With a translation memory, exact and fuzzy matches are served locally and only the
+    remaining unique segments go over the network; new translations are added to it.
+    A backend is fully batched only once its probe batches have come back aligned (see
+    BatchStats). Batches, and any per-segment retries, are sent concurrently on up to
+    max_workers threads within the backend's concurrency limit. A batch that raises is not
+    retried segment by segment, since the backend is most likely down. Segments that still
+    fail keep their source text and are counted in fallbacks, so callers can avoid
+    persisting the result.
+    Memory entries are keyed by namespace, which defaults to the target language.
+    """
+    namespace = namespace or target
+    translator = translator or GoogleBackend(target)
+    flat = [_flatten(segment) for segment in segments]
+    results: List[Optional[str]] = [None] * len(flat)
+    round_trips = 0
+
+    # One network slot per distinct segment still unknown to the memory
+    pending: Dict[str, List[int]] = {}
+    for i, segment in enumerate(flat):
+        match = memory.lookup(segment, namespace) if memory is not None else None
+        if match is not None:
+            results[i] = match.target
+        else:
+            pending.setdefault(normalize_segment(segment), []).append(i)
+    unique = [positions[0] for positions in pending.values()]
+    to_send = [flat[i] for i in unique]
+
+    key = backend_key(translator)
+
+    def send_batch(sources: List[str]) -> Optional[List[Optional[str]]]:
+        """Translated parts; [] when the batch came back misaligned, None when the request failed"""
+        try:
+            translated = translator.translate(BATCH_DELIMITER.join(sources))
+            parts = translated.split(BATCH_DELIMITER) if translated else []
+        except Exception as e:
+            logger.warning(f"Batch translation failed for {len(sources)} segments: {str(e)}")
+            if len(sources) > 1:
+                batch_stats.record(key, "failed")
+            return None
+        if len(sources) > 1:
+            batch_stats.record(key, "aligned" if len(parts) == len(sources) else "misaligned")
+        if len(parts) != len(sources):
+            logger.warning(f"Batch came back with {len(parts)} parts for {len(sources)} segments, retrying singly")
+            return []
+        return [part.strip() or None for part in parts]
+
+    mode = batch_stats.mode(key)
+    packed = pack_batches(to_send, max_chars) if mode != SINGLE else [[i] for i in range(len(to_send))]
+    if mode == PROBE:
+        packed = packed[:1] + [[i] for batch in packed[1:] for i in batch]
+    batches = [[to_send[i] for i in batch] for batch in packed]
+    batch_parts = map_ordered(send_batch, batches, translator, max_workers)
+    round_trips += len(batches)
+
+    # Misaligned batches are retried as a second fan-out rather than inside send_batch, so
+    # retries never wait on permits their own batch is holding
+    retry = [source for sources, parts in zip(batches, batch_parts) if parts == [] for source in sources]
+    if retry:
+        round_trips += len(retry)
+        retried = iter(map_ordered(lambda source: _translate_one(translator, source), retry, translator, max_workers))
+        batch_parts = [
+            [next(retried) for _ in sources] if parts == [] else parts for sources, parts in zip(batches, batch_parts)
+        ]
+
+    translated_unique = [
+        parts[i] if parts is not None else None
+        for sources, parts in zip(batches, batch_parts)
+        for i in range(len(sources))
+    ]
+
+    fallbacks = 0
+    for positions, source, translated in zip(pending.values(), to_send, translated_unique):
+        if translated is None:
+            fallbacks += len(positions)
+            translated = source
+        for i in positions:
+            results[i] = translated
+        # Segments that came back unchanged are usually failures, so they are not remembered
+        if memory is not None and translated != source:
+            memory.add(source, namespace, translated)
+
+    logger.info(
+        f"Translated {len(segments)} segments to '{target}' in {round_trips} requests "
+        f"({len(segments) - len(to_send)} served locally, {fallbacks} kept their source text)"
+    )
+    return SegmentTranslation(results, fallbacks, round_trips)
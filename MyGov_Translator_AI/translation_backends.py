@@ -0,0 +1,125 @@
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+import requests
+from bs4 import BeautifulSoup
+from deep_translator.constants import BASE_URLS
+from deep_translator.exceptions import RequestError, TooManyRequests, TranslationNotFound
+from requests.adapters import HTTPAdapter
+
+from resilience import LatencyTracker
+
+logger = logging.getLogger(__name__)
+
+
+# Keep-alive connections held per target language; raise it alongside translation concurrency
+DEFAULT_POOL_SIZE = int(os.getenv("MYGOV_TRANSLATE_POOL_SIZE", "4"))
+
+
+class GoogleBackend:
+    """Google Translate's mobile endpoint (the page deep_translator scrapes) over one pooled session.
+
+    deep_translator issues a bare `requests.get` per call, paying a fresh TCP and TLS handshake
+    every time. This keeps a long-lived keep-alive session instead, so repeated calls reuse
+    warm connections.
+    """
+
+    name = "google"
+
+    def __init__(self, target: str, source: str = "auto", pool_size: int = DEFAULT_POOL_SIZE,
+                 timeout: float = 15.0, base_url: str = BASE_URLS["GOOGLE_TRANSLATE"]):
+        self.target = target
+        self.source = source
+        self.pool_size = pool_size
+        # More requests in flight than pooled connections would just open throwaway ones
+        self.concurrency = pool_size
+        self.timeout = timeout
+        self.base_url = base_url
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.latency = LatencyTracker(window=500, min_samples=1)
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.failures = 0
+        self.total_latency = 0.0
+
+    def _record(self, seconds: float, ok: bool) -> None:
+        with self._lock:
+            self.requests += 1
+            self.total_latency += seconds
+            if not ok:
+                self.failures += 1
+        if ok:
+            self.latency.record(seconds)
+
+    def translate(self, text: str) -> str:
+        if not text.strip():
+            return text
+        start = time.monotonic()
+        ok = False
+        try:
+            response = self.session.get(
+                self.base_url, params={"tl": self.target, "sl": self.source, "q": text.strip()}, timeout=self.timeout
+            )
+            if response.status_code == 429:
+                raise TooManyRequests()
+            if response.status_code != 200:
+                raise RequestError()
+            soup = BeautifulSoup(response.text, "html.parser")
+            element = soup.find("div", {"class": "t0"}) or soup.find("div", {"class": "result-container"})
+            if element is None:
+                raise TranslationNotFound(text)
+            ok = True
+            return element.get_text(strip=True)
+        finally:
+            self._record(time.monotonic() - start, ok)
+
+    def stats(self) -> Dict[str, float]:
+        p50 = self.latency.percentile(0.5)
+        p95 = self.latency.percentile(0.95)
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "failures": self.failures,
+                "avg_latency_ms": round(self.total_latency / self.requests * 1000, 1) if self.requests else 0.0,
+                "p50_latency_ms": round(p50 * 1000, 1) if p50 is not None else None,
+                "p95_latency_ms": round(p95 * 1000, 1) if p95 is not None else None,
+            }
+
+    def close(self) -> None:
+        self.session.close()
+
+
+class BackendPool:
+    """One long-lived backend per target language, created on first use and shared by all callers"""
+
+    def __init__(self, factory: Optional[Callable[..., GoogleBackend]] = None, pool_size: int = DEFAULT_POOL_SIZE):
+        self.factory = factory or GoogleBackend
+        self.pool_size = pool_size
+        # More requests in flight than pooled connections would just open throwaway ones
+        self.concurrency = pool_size
+        self._backends: Dict[str, GoogleBackend] = {}
+        self._lock = threading.Lock()
+
+    def get(self, target: str) -> GoogleBackend:
+        with self._lock:
+            backend = self._backends.get(target)
+            if backend is None:
+                backend = self._backends[target] = self.factory(target, pool_size=self.pool_size)
+            return backend
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            backends = dict(self._backends)
+        return {target: backend.stats() for target, backend in backends.items()}
+
+    def close(self) -> None:
+        with self._lock:
+            for backend in self._backends.values():
+                backend.close()
+            self._backends.clear()
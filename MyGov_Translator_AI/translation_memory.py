@@ -0,0 +1,113 @@
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+_WORD = re.compile(r"\w+")
+
+
+def normalize_segment(text: str) -> str:
+    return " ".join(text.split()).casefold()
+
+
+def segment_hash(text: str) -> str:
+    return hashlib.sha256(normalize_segment(text).encode("utf-8")).hexdigest()
+
+
+def content_words(text: str) -> List[str]:
+    """Words and numbers of the normalized text, in order, without punctuation or markup"""
+    return _WORD.findall(normalize_segment(text))
+
+
+def content_hash(text: str) -> Optional[str]:
+    """Hash of content_words(text); None for segments with no words, which must never match each other"""
+    words = content_words(text)
+    return hashlib.sha256(" ".join(words).encode("utf-8")).hexdigest() if words else None
+
+
+@dataclass
+class MemoryMatch:
+    target: str
+    exact: bool
+
+
+class TranslationMemory:
+    """Sentence-level translation memory in SQLite with exact and fuzzy lookup, both indexed.
+
+    Exact hits are keyed by the hash of the normalized sentence and target language. Fuzzy
+    hits are keyed by the hash of its words alone, so they match sentences that differ only
+    in punctuation, markup or spacing ("Aadhaar card." and "**Aadhaar card**"). A stored
+    translation is returned verbatim, so any differing word would change its meaning:
+    "SC" vs "ST", "male" vs "female", "Rs 2 lakh" vs "Rs 3 lakh".
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS tm_segments (
+                    id INTEGER PRIMARY KEY,
+                    language TEXT NOT NULL,
+                    source_hash TEXT NOT NULL,
+                    content_hash TEXT,
+                    source TEXT NOT NULL,
+                    target TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    UNIQUE (language, source_hash)
+                );
+                CREATE INDEX IF NOT EXISTS idx_tm_content ON tm_segments (language, content_hash);
+                """
+            )
+        self.lookups = 0
+        self.exact_hits = 0
+        self.fuzzy_hits = 0
+
+    def lookup(self, source: str, language: str) -> Optional[MemoryMatch]:
+        """Stored translation for source: the same sentence first, then one with the same words"""
+        fuzzy_key = content_hash(source)
+        with self._lock:
+            self.lookups += 1
+            row = self._conn.execute(
+                "SELECT target FROM tm_segments WHERE language = ? AND source_hash = ?",
+                (language, segment_hash(source)),
+            ).fetchone()
+            if row is not None:
+                self.exact_hits += 1
+                return MemoryMatch(row[0], True)
+            if fuzzy_key is None:
+                return None
+            row = self._conn.execute(
+                "SELECT target FROM tm_segments WHERE language = ? AND content_hash = ? ORDER BY id DESC LIMIT 1",
+                (language, fuzzy_key),
+            ).fetchone()
+            if row is None:
+                return None
+            self.fuzzy_hits += 1
+            return MemoryMatch(row[0], False)
+
+    def add(self, source: str, language: str, target: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO tm_segments (language, source_hash, content_hash, source, target, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (language, segment_hash(source), content_hash(source), source, target, time.time()),
+            )
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM tm_segments").fetchone()[0]
+            hits = self.exact_hits + self.fuzzy_hits
+            return {
+                "entries": entries,
+                "lookups": self.lookups,
+                "exact_hits": self.exact_hits,
+                "fuzzy_hits": self.fuzzy_hits,
+                "hit_rate": round(hits / self.lookups, 3) if self.lookups else 0.0,
+            }